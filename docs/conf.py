@@ -10,4 +10,13 @@ extensions = [
     "myst_parser",
 ]
 autodoc_typehints = "description"
+# Don't import the heavy runtime dependencies just to render the docs
+autodoc_mock_imports = [
+    "pandas",
+    "numpy",
+    "requests",
+    "dateutil",
+    "rapidfuzz",
+    "dotenv",
+]
 html_theme = "furo"
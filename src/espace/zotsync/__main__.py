@@ -1,202 +1,224 @@
 """Command-line interface."""
 
-import typer
+import functools
+import os
+import click
+from click.core import ParameterSource
 from pathlib import Path
 
-from .zot_export import make_asreview_csv_from_db
-from .zot_import import apply_asreview_decisions
-from .zot_import import remove_review_tags
-
 import espace.zotsync.const as const
 
-# Load environment variables from a .env file if present
-try:
-    from dotenv import load_dotenv  # type: ignore
-except Exception:
-    load_dotenv = None  # type: ignore
-if load_dotenv:
+_REVIEW_TAGS_DESC = f"({const.REVIEW_DECISION_PREFIX}, {const.REVIEW_TIME_PREFIX}, {const.REVIEW_REASON_PREFIX})"
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_dotenv(path: str, mtime_ns: int) -> dict[str, str | None]:
+    """Parse a .env file; cached per (path, mtime) so an unchanged file is parsed once."""
+    from dotenv import dotenv_values  # type: ignore
+
+    return dotenv_values(path)
+
+
+def _load_env_cached() -> bool:
+    """Load the nearest .env into os.environ, re-parsing only when the file changed."""
+    if os.environ.get(const.ENV_SKIP_DOTENV) == "1":
+        return False
+    try:
+        from dotenv import find_dotenv  # type: ignore
+    except Exception:
+        return False
+    path = find_dotenv()
+    if not path:
+        return False
+    try:
+        values = _parse_dotenv(path, os.stat(path).st_mtime_ns)
+    except OSError:
+        return False
     # Do not override already-set environment variables
-    load_dotenv(override=False)
-    typer.echo("Loaded environment variables from .env file", err=True)
+    for k, v in values.items():
+        if v is not None:
+            os.environ.setdefault(k, v)
+    return True
 
 
-def _version_callback(value: bool):
-    if value:
-        typer.echo("zotsync, version 0.0.1")
-        raise typer.Exit()
+# Options shared by several commands; defined once and applied per command
+_library_id_option = click.option(
+    "--library-id", help="Zotero UserID of GroupID", envvar=const.ENV_LIBRARY_ID
+)
+_library_type_option = click.option(
+    "--library-type",
+    default="groups",
+    help="Zotero library type (users of groups)",
+    envvar=const.ENV_LIBRARY_TYPE,
+)
+_api_key_option = click.option(
+    "--api-key",
+    help="Zotero API key. Alleen noodzakelijk als Zotero niet lokaal draait.",
+    envvar=const.ENV_API_KEY,
+)
+_fuzzy_threshold_option = click.option(
+    "--fuzzy-threshold",
+    type=float,
+    default=0.90,
+    help="Drempel voor fuzzy titelmatch (0-1)",
+    envvar=const.ENV_FUZZY_THRESHOLD,
+)
+_db_path_option = click.option(
+    "--db-path",
+    type=click.Path(dir_okay=False, resolve_path=True, path_type=Path),
+    default=const.DEFAULT_SQLITE_PATH,
+    help="Pad naar SQLite database",
+    envvar=const.ENV_DB_PATH,
+)
+_dry_run_option = click.option(
+    "--dry-run", is_flag=True, help="Niet wegschrijven; alleen tellen."
+)
 
 
-app = typer.Typer(help="Zotero ↔ ASReview CLI")
+def _require_library_id(library_id: str | None) -> str:
+    if not library_id:
+        click.secho(
+            f"Missing library-id: provide --library-id or set {const.ENV_LIBRARY_ID} in your environment/.env",
+            fg="red",
+        )
+        raise click.exceptions.Exit(2)
+    return library_id
 
 
-@app.callback()
-def main(
-    version: bool = typer.Option(
-        False,
-        "--version",
-        "-v",
-        help="Show the version and exit.",
-        is_eager=True,
-        callback=_version_callback,
-    )
-):
-    pass
+@click.group(help="Zotero ↔ ASReview CLI", context_settings={"show_default": True})
+@click.version_option(
+    "0.0.1", "--version", "-v", prog_name="zotsync", help="Show the version and exit."
+)
+def app():
+    # Runs only once a subcommand is dispatched (eager --help/--version exit
+    # earlier) and before that subcommand's envvar-backed options are parsed.
+    if _load_env_cached() and os.environ.get(const.ENV_VERBOSE):
+        click.echo("Loaded environment variables from .env file", err=True)
 
 
 @app.command(name="export", help="Exporteer Zotero bibliotheek naar ASReview CSV")
+@click.argument("out_csv", type=click.Path(dir_okay=False, path_type=Path))
+@_library_id_option
+@_library_type_option
+@click.option(
+    "--dedupe",
+    "deduplicate",
+    is_flag=True,
+    help="(De)activeer deduplicatie (default: uit)",
+    envvar=const.ENV_DEDUPLICATE,
+)
+@_db_path_option
 def zot_export_hyphen(
-    out_csv: str = typer.Argument(..., help="Output CSV file"),
-    library_id: str | None = typer.Option(
-        None, "--library-id", help="Zotero library ID", envvar="ZOTSYNC_LIBRARY_ID"
-    ),
-    library_type: str = typer.Option(
-        "groups",
-        help="Zotero library type (users of groups)",
-        envvar="ZOTSYNC_LIBRARY_TYPE",
-    ),
-    deduplicate: bool = typer.Option(
-        False,
-        "--dedupe",
-        help="(De)activeer deduplicatie (default: uit)",
-        envvar="ZOTSYNC_DEDUPLICATE",
-    ),
-    db_path: str = typer.Option(
-        const.DEFAULT_SQLITE_PATH,
-        help="Pad naar SQLite database",
-        envvar="ZOTSYNC_DB_PATH",
-    ),
+    out_csv: Path,
+    library_id: str | None,
+    library_type: str,
+    deduplicate: bool,
+    db_path: Path,
 ):
-    if not library_id:
-        typer.secho(
-            "Missing library-id: provide --library-id or set ZOTSYNC_LIBRARY_ID in your environment/.env",
-            fg=typer.colors.RED,
-        )
-        raise typer.Exit(code=2)
+    from .zot_export import make_asreview_csv_from_db
+
     make_asreview_csv_from_db(
-        out_csv=Path(out_csv),
-        library_id=library_id,
+        out_csv=out_csv,
+        library_id=_require_library_id(library_id),
         library_type=library_type,
         deduplicate=deduplicate,
-        db_path=Path(db_path),
+        db_path=db_path,
     )
-    typer.echo(f"ASReview CSV written to: {out_csv}")
+    click.echo(f"ASReview CSV written to: {out_csv}")
 
 
 @app.command(
     name="import",
-    help=f"Importeer ASReview beslissingen terug naar Zotero als review-tags ({const.REVIEW_DECISION_PREFIX}, {const.REVIEW_TIME_PREFIX}, {const.REVIEW_REASON_PREFIX})",
+    help=f"Importeer ASReview beslissingen terug naar Zotero als review-tags {_REVIEW_TAGS_DESC}",
+)
+@click.argument(
+    "asr_csv",
+    type=click.Path(exists=True, dir_okay=False, resolve_path=True, path_type=Path),
 )
+@_api_key_option
+@_library_id_option
+@_library_type_option
+@_fuzzy_threshold_option
+@_db_path_option
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, resolve_path=True, path_type=Path),
+    default=None,
+    help="Map voor een lokale kopie van de bibliotheek; importeert via de API i.p.v. de SQLite database. Volgende runs halen alleen wijzigingen op",
+    envvar=const.ENV_CACHE_DIR,
+)
+@_dry_run_option
 def zot_import_hyphen(
-    asr_csv: str = typer.Argument(..., help="ASReview CSV met 'included' kolom"),
-    api_key: str = typer.Option(
-        None,
-        help="Zotero API key. Alleen noodzakelijk als Zotero niet lokaal draait.",
-        envvar="ZOTSYNC_API_KEY",
-    ),
-    library_id: str | None = typer.Option(
-        None,
-        "--library-id",
-        help="Zotero UserID of GroupID",
-        envvar="ZOTSYNC_LIBRARY_ID",
-    ),
-    library_type: str = typer.Option(
-        "groups",
-        help="Zotero library type (users of groups)",
-        envvar="ZOTSYNC_LIBRARY_TYPE",
-    ),
-    fuzzy_threshold: float = typer.Option(
-        0.90,
-        help="Drempel voor fuzzy titelmatch (0-1)",
-        envvar="ZOTSYNC_FUZZY_THRESHOLD",
-    ),
-    db_path: str = typer.Option(
-        const.DEFAULT_SQLITE_PATH,
-        help="Pad naar SQLite database",
-        envvar="ZOTSYNC_DB_PATH",
-    ),
-    dry_run: bool = typer.Option(
-        False,
-        "--dry-run",
-        help="Niet wegschrijven; alleen tellen.",
-        is_flag=True,
-    ),
+    asr_csv: Path,
+    api_key: str | None,
+    library_id: str | None,
+    library_type: str,
+    fuzzy_threshold: float,
+    db_path: Path | None,
+    cache_dir: Path | None,
+    dry_run: bool,
 ):
-    if not library_id:
-        typer.secho(
-            "Missing library-id: provide --library-id or set ZOTSYNC_LIBRARY_ID in your environment .env",
-            fg=typer.colors.RED,
-        )
-        raise typer.Exit(code=2)
+    from .zot_import import apply_asreview_decisions
+
+    if cache_dir is not None:
+        # The cache belongs to the API path; --db-path always has a default, so
+        # only an explicitly given database conflicts with it
+        source = click.get_current_context().get_parameter_source("db_path")
+        if source is not ParameterSource.DEFAULT:
+            click.secho(
+                f"--cache-dir imports through the Zotero API: drop --db-path (or unset {const.ENV_DB_PATH})",
+                fg="red",
+            )
+            raise click.exceptions.Exit(2)
+        db_path = None
+
     res = apply_asreview_decisions(
-        asr_csv=Path(asr_csv),
+        asr_csv=asr_csv,
         api_key=api_key,
-        library_id=library_id,
+        library_id=_require_library_id(library_id),
         library_type=library_type,
         fuzzy_threshold=fuzzy_threshold,
-        db_path=Path(db_path),
+        db_path=db_path,
+        cache_dir=cache_dir,
         dry_run=dry_run,
     )
-    typer.secho(
+    click.secho(
         f"[DONE] updated={res['updated']} not_found={res['not_found']} errors={res['errors']}",
-        fg=typer.colors.GREEN,
+        fg="green",
     )
 
 
 @app.command(
     name="clean",
-    help=f"Verwijder alle review-tags ({const.REVIEW_DECISION_PREFIX}, {const.REVIEW_TIME_PREFIX}, {const.REVIEW_REASON_PREFIX}) uit Zotero voor de opgegeven bibliotheek. Geen andere tags worden verwijderd",
+    help=f"Verwijder alle review-tags {_REVIEW_TAGS_DESC} uit Zotero voor de opgegeven bibliotheek. Geen andere tags worden verwijderd",
 )
+@_api_key_option
+@_library_id_option
+@_library_type_option
+@_fuzzy_threshold_option
+@_db_path_option
+@_dry_run_option
 def zot_clean_hyphen(
-    api_key: str = typer.Option(
-        None,
-        help="Zotero API key. Alleen noodzakelijk als Zotero niet lokaal draait.",
-        envvar="ZOTSYNC_API_KEY",
-    ),
-    library_id: str | None = typer.Option(
-        None,
-        "--library-id",
-        help="Zotero UserID of GroupID",
-        envvar="ZOTSYNC_LIBRARY_ID",
-    ),
-    library_type: str = typer.Option(
-        "groups",
-        help="Zotero library type (users or groups)",
-        envvar="ZOTSYNC_LIBRARY_TYPE",
-    ),
-    fuzzy_threshold: float = typer.Option(
-        0.90,
-        help="Drempel voor fuzzy titelmatch (0-1)",
-        envvar="ZOTSYNC_FUZZY_THRESHOLD",
-    ),
-    db_path: str = typer.Option(
-        const.DEFAULT_SQLITE_PATH,
-        help="Pad naar SQLite database",
-        envvar="ZOTSYNC_DB_PATH",
-    ),
-    dry_run: bool = typer.Option(
-        False,
-        "--dry-run",
-        help="Niet wegschrijven; alleen tellen.",
-        is_flag=True,
-    ),
+    api_key: str | None,
+    library_id: str | None,
+    library_type: str,
+    fuzzy_threshold: float,
+    db_path: Path,
+    dry_run: bool,
 ):
-    if not library_id:
-        typer.secho(
-            "Missing library-id: provide --library-id or set ZOTSYNC_LIBRARY_ID in your environment/.env",
-            fg=typer.colors.RED,
-        )
-        raise typer.Exit(code=2)
+    from .zot_import import remove_review_tags
+
     res = remove_review_tags(
         api_key=api_key,
-        library_id=library_id,
+        library_id=_require_library_id(library_id),
         library_type=library_type,
         fuzzy_threshold=fuzzy_threshold,
         dry_run=dry_run,
-        db_path=Path(db_path),
+        db_path=db_path,
     )
-    typer.secho(
+    click.secho(
         f"[CLEANED] removed={res['removed']} errors={res['errors']}",
-        fg=typer.colors.GREEN,
+        fg="green",
     )
 
 
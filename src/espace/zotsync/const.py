@@ -13,6 +13,17 @@ DECISION_EXCLUDED = "excluded"
 # Default SQLite database location
 DEFAULT_SQLITE_PATH = Path.home() / "kDrive" / "Zotero" / "zotero.sqlite"
 
+# Environment variables read by the CLI (also settable via .env)
+ENV_LIBRARY_ID = "ZOTSYNC_LIBRARY_ID"
+ENV_LIBRARY_TYPE = "ZOTSYNC_LIBRARY_TYPE"
+ENV_API_KEY = "ZOTSYNC_API_KEY"
+ENV_DB_PATH = "ZOTSYNC_DB_PATH"
+ENV_CACHE_DIR = "ZOTSYNC_CACHE_DIR"
+ENV_FUZZY_THRESHOLD = "ZOTSYNC_FUZZY_THRESHOLD"
+ENV_DEDUPLICATE = "ZOTSYNC_DEDUPLICATE"
+ENV_SKIP_DOTENV = "ZOTSYNC_SKIP_DOTENV"
+ENV_VERBOSE = "ZOTSYNC_VERBOSE"
+
 # Supported library types
 LIBRARY_TYPE_USER = "users"
 LIBRARY_TYPE_GROUP = "groups"
@@ -9,72 +9,197 @@ Features:
 Public API:
     make_asreview_csv(zotero_csv: Path, out_csv: Path, api_key: Optional[str] = None,
                       library_id: Optional[str] = None, library_type: str = "users",
-                      add_pdf_links: bool = False) -> None
+                      add_pdf_links: bool = False, deduplicate: bool = True,
+                      http_cache: Optional[Path] = None) -> None
 """
 
 from __future__ import annotations
 
 from . import const
 
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import os
 import re
 import sqlite3
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
-import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dateutil import parser as dtp
 
+try:  # optioneel: persistente cache van Zotero API-responses
+    import requests_cache
+except ImportError:  # pragma: no cover
+    requests_cache = None
+
 REQUIRED_ASR_COLS = ["title", "abstract", "authors", "keywords", "doi", "url", "year"]
 
+# Map common Zotero CSV headers (adjust here if your locale differs)
+_ZOTERO_CSV_COLMAP = {
+    "Title": "title",
+    "Abstract Note": "abstract",
+    "Author": "authors",
+    "Publication Year": "year",
+    "Date": "date",
+    "DOI": "doi",
+    "Url": "url",
+    "URL": "url",
+    "Manual Tags": "keywords",
+    "Automatic Tags": "_auto_tags",
+}
+# Rows per chunk when streaming a Zotero CSV export
+_CSV_CHUNK_ROWS = 10_000
+# Concurrent Zotero API lookups for PDF links
+_API_WORKERS = 8
+# Seconds a cached Zotero API response stays valid (see `http_cache`)
+_HTTP_CACHE_EXPIRE = 24 * 60 * 60
+
+
+_WS_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+# ';'-separated list separators, with any surrounding whitespace and empty entries
+_LIST_SEP_RE = re.compile(r"\s*;[\s;]*")
+# A 'nan' entry in a normalized 'a; b; c' list
+_NAN_ENTRY_RE = re.compile(r"(?i)(?:^|(?<=; ))nan(?:; |$)")
+
 
 # ------------------------------- helpers ------------------------------------
 def _norm(s: object) -> str:
     if s is None:
         return ""
-    return re.sub(r"\s+", " ", str(s)).strip()
+    return _norm_str(str(s))
+
+
+@functools.lru_cache(maxsize=65536)
+def _norm_str(s: str) -> str:
+    """Cached core of `_norm`: the same DOIs and dates recur across lookups."""
+    return _WS_RE.sub(" ", s).strip()
+
+
+def _norm_col(col: pd.Series) -> pd.Series:
+    """Vectorized `_norm` for a whole column; missing values become ''."""
+    return col.fillna("").astype(str).str.replace(_WS_RE, " ", regex=True).str.strip()
+
+
+def _norm_list_col(col: pd.Series) -> pd.Series:
+    """Normalize a column of ';'-separated lists to 'a; b; c' (no empty entries)."""
+    col = _norm_col(col).str.replace(_LIST_SEP_RE, "; ", regex=True).str.strip("; ")
+    return col.mask(col.str.lower() == "nan", "")
+
+
+def _year_col(date: pd.Series, year: pd.Series | None = None) -> pd.Series:
+    """Vectorized `_guess_year` of `date`, for the rows without a (normalized) `year`.
+
+    A year in the date is taken with one regex pass; only dates without one
+    go through the (slow) dateutil parser.
+    """
+    date = _norm_col(date)
+    year = pd.Series("", index=date.index) if year is None else _norm_col(year)
+    from_date = date.str.extract(f"({_YEAR_RE.pattern})", expand=False).fillna("")
+    rest = (year == "") & (from_date == "") & (date != "")
+    from_date[rest] = date[rest].map(_guess_year)
+    return year.where(year != "", from_date)
 
 
 def _guess_year(s: str) -> str:
     s = _norm(s)
     if not s:
         return ""
+    # Cheap paths first: Zotero dates are mostly a year or an ISO date. ASCII
+    # only: isdigit() also accepts digits such as '²' that int() rejects
+    head = s[:4]
+    if head.isascii() and head.isdigit() and 1900 <= int(head) <= 2099:
+        return head
+    m = _YEAR_RE.search(s)
+    if m:
+        return m.group(0)
     try:
         return str(dtp.parse(s, fuzzy=True).year)
     except Exception:
-        m = re.search(r"(19|20)\d{2}", s)
-        return m.group(0) if m else ""
-
+        return ""
 
-def _first_nonempty(*vals: object) -> str:
-    for v in vals:
-        v = _norm(v)
-        if v:
-            return v
-    return ""
 
+def _fingerprints(out: pd.DataFrame) -> pd.Series:
+    """Dedup key per row: the DOI if there is one, else title+year.
 
-def _build_fingerprint(title: str, year: str, doi: str) -> str:
-    doi = _norm(doi).lower()
-    if doi:
-        return f"doi:{doi}"
-    base = f"{_norm(title).lower()}|{_norm(year)}"
-    return (
-        "tsh:" + hashlib.sha1(base.encode("utf-8")).hexdigest()[:16]
-    )  # nosec B324 (optioneel)
+    Returned as 64-bit hashes (vectorized, no Python call per row), which keeps
+    the cross-chunk set of seen keys small.
+    """
+    doi = _norm_col(out["doi"]).str.lower()
+    keys = "doi:" + doi
+    # Title and year are only normalized for the rows without a DOI
+    no_doi = doi == ""
+    if no_doi.any():
+        rest = out.loc[no_doi]
+        title = _norm_col(rest["title"]).str.lower()
+        keys[no_doi] = "ty:" + title + "|" + _norm_col(rest["year"])
+    return pd.util.hash_pandas_object(keys, index=False)
+
+
+def _local_pdfs(storage: Path, item_keys: pd.Series) -> dict:
+    """Map item keys to the first PDF in their Zotero storage folder."""
+    # One listing of the storage root instead of exists()/is_dir()/glob() per row
+    try:
+        with os.scandir(storage) as it:
+            folders = {e.name for e in it if e.is_dir()}
+    except OSError:
+        return {}
+    pdfs = {}
+    for key in set(item_keys) & folders:
+        with os.scandir(storage / key) as it:
+            for e in it:
+                if e.name.endswith(".pdf") and not e.name.startswith("."):
+                    pdfs[key] = (storage / key / e.name).as_posix()
+                    break
+    return pdfs
+
+
+def _open_sqlite_ro(db_path: Path) -> sqlite3.Connection:
+    """Open the Zotero database read-only, with a large page cache and mmap I/O."""
+    # No immutable=1: Zotero may be running and writing to the database
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MiB
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
 
 
 def _zotero_base(lib_type: str, lib_id: str) -> str:
     return f"https://api.zotero.org/{lib_type}/{lib_id}"
 
 
-def _zotero_session(api_key: Optional[str]) -> requests.Session:
-    s = requests.Session()
+def _zotero_session(
+    api_key: Optional[str], http_cache: Optional[Path] = None
+) -> requests.Session:
+    if http_cache is None:
+        s = requests.Session()
+    elif requests_cache is None:
+        raise ImportError("http_cache requires the 'requests-cache' package")
+    else:
+        # Responses are kept in a SQLite file, so reruns skip the network
+        s = requests_cache.CachedSession(
+            cache_name=str(http_cache),
+            backend="sqlite",
+            expire_after=_HTTP_CACHE_EXPIRE,
+        )
     if api_key:
         s.headers.update({"Zotero-API-Key": api_key})
     s.headers.update({"Content-Type": "application/json"})
+    # Keep-alive pool for the concurrent PDF-link lookups; retry rate limits
+    # (429, honouring Retry-After) and transient server errors
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     return s
 
 
@@ -83,7 +208,7 @@ def _search_zotero_by_doi(session: requests.Session, base: str, doi: str):
         return None
     r = session.get(
         f"{base}/items",
-        params={"q": doi, "qmode": "everything", "format": "json", "limit": 25},
+        params={"q": doi, "qmode": "everything", "format": "json", "limit": 10},
     )
     if r.status_code != 200:
         return None
@@ -115,6 +240,13 @@ def _zotero_child_pdf_link(session: requests.Session, base: str, item_key: str)
     return ""
 
 
+def _pdf_link_for_doi(session: requests.Session, base: str, doi: str) -> str:
+    item = _search_zotero_by_doi(session, base, doi)
+    if not item:
+        return ""
+    return _zotero_child_pdf_link(session, base, item.get("key"))
+
+
 # ------------------------------- core API -----------------------------------
 def make_asreview_csv(
     zotero_csv: Path,
@@ -124,6 +256,7 @@ def make_asreview_csv(
     library_type: str = "users",
     add_pdf_links: bool = False,
     deduplicate: bool = True,
+    http_cache: Optional[Path] = None,
 ) -> None:
     """
     Build an ASReview-ready CSV from a Zotero CSV export.
@@ -136,56 +269,73 @@ def make_asreview_csv(
       library_type: 'users' or 'groups'.
       add_pdf_links: If True, adds a 'zotero_pdf' column with zotero://open-pdf links.
       deduplicate: If True, remove duplicates (by DOI, else title+year fingerprint). If False, keep all rows.
+      http_cache: (Optional) SQLite file to cache Zotero API responses in for a day
+        (requires `requests-cache`), so reruns of the PDF-link lookups skip the network.
     """
-    df = pd.read_csv(zotero_csv)
-
-    # Map common Zotero CSV headers (adjust here if your locale differs)
-    colmap = {
-        "Title": "title",
-        "Abstract Note": "abstract",
-        "Author": "authors",
-        "Publication Year": "year",
-        "Date": "date",
-        "DOI": "doi",
-        "Url": "url",
-        "URL": "url",
-        "Manual Tags": "keywords",
-        "Automatic Tags": "_auto_tags",
-    }
+    # Only the columns we map are read, as text, and a chunk at a time: large
+    # exports never have to fit in memory at once
+    wanted = {*_ZOTERO_CSV_COLMAP, const.ASR_LABEL_COL, const.ASR_TIME_COL}
+    wanted.add(const.ASR_NOTE_COL)
+    chunks = pd.read_csv(
+        zotero_csv,
+        dtype=str,
+        keep_default_na=False,
+        usecols=lambda c: c in wanted,
+        chunksize=_CSV_CHUNK_ROWS,
+    )
+
+    session = base = None
+    if add_pdf_links and api_key and library_id:
+        session = _zotero_session(api_key, http_cache=http_cache)
+        base = _zotero_base(library_type, library_id)
+
+    out_csv.parent.mkdir(parents=True, exist_ok=True)
+    seen: set[int] = set()  # fingerprints already written, across chunks
+    pdf_links: dict[str, str] = {}  # doi -> zotero://open-pdf link ('' if none)
+    first = True
+    for df in chunks:
+        out = _asreview_frame(df)
+
+        # Deduplicate (DOI first, else title+year fingerprint)
+        if deduplicate:
+            fps = _fingerprints(out)
+            keep = ~fps.duplicated() & ~fps.isin(seen)
+            seen.update(fps[keep])
+            out = out.loc[keep].copy()
+
+        # Optional: add zotero://open-pdf link if API info present
+        if session is not None:
+            # Each DOI is looked up once per run, concurrently (independent GETs)
+            new_dois = [d for d in out["doi"].unique() if d not in pdf_links]
+            with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+                found = pool.map(
+                    lambda doi: _pdf_link_for_doi(session, base, doi), new_dois
+                )
+                pdf_links.update(zip(new_dois, found))
+            out["zotero_pdf"] = out["doi"].map(pdf_links)
+
+        out.to_csv(out_csv, index=False, mode="w" if first else "a", header=first)
+        first = False
+
+
+def _asreview_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Map (a chunk of) a Zotero CSV export onto the ASReview columns."""
     nd = {}
-    for zcol, tcol in colmap.items():
+    for zcol, tcol in _ZOTERO_CSV_COLMAP.items():
         nd[tcol] = df[zcol] if zcol in df.columns else ""
-    ndf = pd.DataFrame(nd)
-
-    out = pd.DataFrame()
-    out["title"] = ndf["title"].map(_norm)
-    out["abstract"] = ndf["abstract"].map(_norm)
-
-    def _norm_authors(s: str) -> str:
-        s = _norm(s)
-        if not s or s.lower() == "nan":
-            return ""
-        parts = [a.strip() for a in s.split(";") if a.strip()]
-        return "; ".join(parts)
-
-    out["authors"] = ndf["authors"].map(_norm_authors)
-
-    def _combine_keywords(row) -> str:
-        k = _norm(row.get("keywords", ""))
-        a = _norm(row.get("_auto_tags", ""))
-        if k and a:
-            return "; ".join([k, a])
-        return k or a
-
-    out["keywords"] = ndf.apply(_combine_keywords, axis=1)
-    out["doi"] = ndf["doi"].map(lambda s: _norm(s).lower())
-    out["url"] = ndf["url"].map(_norm)
-    out["year"] = ndf.apply(
-        lambda r: _first_nonempty(
-            _norm(r.get("year", "")), _guess_year(r.get("date", ""))
-        ),
-        axis=1,
-    )
+    ndf = pd.DataFrame(nd, index=df.index)
+
+    # Column-wise string operations instead of a Python call per cell
+    out = pd.DataFrame(index=df.index)
+    out["title"] = _norm_col(ndf["title"])
+    out["abstract"] = _norm_col(ndf["abstract"])
+    out["authors"] = _norm_list_col(ndf["authors"])
+    k = _norm_col(ndf["keywords"])
+    a = _norm_col(ndf["_auto_tags"])
+    out["keywords"] = (k + "; " + a).where((k != "") & (a != ""), k + a)
+    out["doi"] = _norm_col(ndf["doi"]).str.lower()
+    out["url"] = _norm_col(ndf["url"])
+    out["year"] = _year_col(ndf["date"], ndf["year"])
 
     # Voeg optionele ASReview kolommen toe indien beschikbaar
     for col in [const.ASR_LABEL_COL, const.ASR_TIME_COL, const.ASR_NOTE_COL]:
@@ -198,34 +348,7 @@ def make_asreview_csv(
     for c in REQUIRED_ASR_COLS:
         if c not in out.columns:
             out[c] = ""
-
-    # Zorg dat ook de optionele reviewvelden aanwezig zijn
-    for c in [const.ASR_LABEL_COL, const.ASR_TIME_COL, const.ASR_NOTE_COL]:
-        if c not in out.columns:
-            out[c] = ""
-
-    # Deduplicate (DOI first, else title+year fingerprint)
-    if deduplicate:
-        fps = out.apply(
-            lambda r: _build_fingerprint(r["title"], r["year"], r["doi"]), axis=1
-        )
-        out = out.loc[~fps.duplicated()].copy()
-
-    # Optional: add zotero://open-pdf link if API info present
-    if add_pdf_links and api_key and library_id:
-        session = _zotero_session(api_key)
-        base = _zotero_base(library_type, library_id)
-        links = []
-        for _, row in out.iterrows():
-            link = ""
-            item = _search_zotero_by_doi(session, base, row["doi"])
-            if item:
-                link = _zotero_child_pdf_link(session, base, item.get("key"))
-            links.append(link)
-        out["zotero_pdf"] = links
-
-    out_csv.parent.mkdir(parents=True, exist_ok=True)
-    out.to_csv(out_csv, index=False)
+    return out
 
 
 def make_asreview_csv_from_db(
@@ -244,40 +367,53 @@ def make_asreview_csv_from_db(
       out_csv: Output CSV path for ASReview.
       deduplicate: If True, remove duplicates (by DOI, else title+year fingerprint). If False, keep all rows.
     """
-    conn = sqlite3.connect(db_path)
+    conn = _open_sqlite_ro(db_path)
     cur = conn.cursor()
     cur.execute("SELECT libraryID FROM groups WHERE groupID = ?", (library_id,))
     group = cur.fetchone()
     if not group:
+        conn.close()
         return
     group_id = group[0]
 
+    # Resolve the fieldIDs once instead of a subquery per join, and read every
+    # field in a single pass over itemData (pivoted per item)
+    names = ("title", "abstractNote", "date", "DOI", "url")
+    cur.execute(
+        f"SELECT fieldName, fieldID FROM fields WHERE fieldName IN ({','.join('?' * len(names))})",
+        names,
+    )
+    field_ids = dict(cur.fetchall())
+    fid = {name: int(field_ids.get(name, -1)) for name in names}
+
     query = f"""
+WITH fieldValues AS (
+  SELECT d.itemID,
+         MAX(CASE WHEN d.fieldID = {fid['title']} THEN v.value END) AS title,
+         MAX(CASE WHEN d.fieldID = {fid['abstractNote']} THEN v.value END) AS abstract,
+         MAX(CASE WHEN d.fieldID = {fid['date']} THEN v.value END) AS year,
+         MAX(CASE WHEN d.fieldID = {fid['DOI']} THEN v.value END) AS doi,
+         MAX(CASE WHEN d.fieldID = {fid['url']} THEN v.value END) AS url
+  FROM itemData d
+  JOIN itemDataValues v ON v.valueID = d.valueID
+  WHERE d.fieldID IN ({', '.join(str(i) for i in fid.values())})
+  GROUP BY d.itemID
+)
   SELECT
   items.key as item_key,
-  titleValues.value as title,
-  abstractValues.value as abstract,
-  authors.value as authors,
-  yearValues.value as year,
-  doiValues.value as doi,
-  urlValues.value as url,
-  tags.value as keywords,
-  ia.filePath as local_url,
-  labelTags.label_value as asreview_label,
-  timeTags.time_value as asreview_time,
-  noteTags.note_value as asreview_note
+  COALESCE(fv.title, '') as title,
+  COALESCE(fv.abstract, '') as abstract,
+  COALESCE(authors.value, '') as authors,
+  COALESCE(fv.year, '') as year,
+  COALESCE(fv.doi, '') as doi,
+  COALESCE(fv.url, '') as url,
+  COALESCE(tags.value, '') as keywords,
+  COALESCE(ia.filePath, '') as local_url,
+  COALESCE(labelTags.label_value, '') as asreview_label,
+  COALESCE(timeTags.time_value, '') as asreview_time,
+  COALESCE(noteTags.note_value, '') as asreview_note
 FROM items
-LEFT JOIN itemData AS titleData
-  ON titleData.itemID = items.itemID
-  AND titleData.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'title' LIMIT 1)
-LEFT JOIN itemDataValues AS titleValues
-  ON titleValues.valueID = titleData.valueID
-
-LEFT JOIN itemData AS abstractData
-  ON abstractData.itemID = items.itemID
-  AND abstractData.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'abstractNote' LIMIT 1)
-LEFT JOIN itemDataValues AS abstractValues
-  ON abstractValues.valueID = abstractData.valueID
+LEFT JOIN fieldValues AS fv ON fv.itemID = items.itemID
 
 LEFT JOIN (
   SELECT ic.itemID, GROUP_CONCAT(c.lastName || ' ' || c.firstName, '; ') AS value
@@ -286,24 +422,6 @@ LEFT JOIN (
   GROUP BY ic.itemID
 ) AS authors ON authors.itemID = items.itemID
 
-LEFT JOIN itemData AS yearData
-  ON yearData.itemID = items.itemID
-  AND yearData.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'date' LIMIT 1)
-LEFT JOIN itemDataValues AS yearValues
-  ON yearValues.valueID = yearData.valueID
-
-LEFT JOIN itemData AS doiData
-  ON doiData.itemID = items.itemID
-  AND doiData.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'DOI' LIMIT 1)
-LEFT JOIN itemDataValues AS doiValues
-  ON doiValues.valueID = doiData.valueID
-
-LEFT JOIN itemData AS urlData
-  ON urlData.itemID = items.itemID
-  AND urlData.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'url' LIMIT 1)
-LEFT JOIN itemDataValues AS urlValues
-  ON urlValues.valueID = urlData.valueID
-
 LEFT JOIN (
   SELECT parentItemID, MIN(path) AS filePath
   FROM itemAttachments
@@ -349,46 +467,32 @@ WHERE items.libraryID = {group_id} AND items.itemTypeID IN (
     WHERE typeName IN ('journalArticle', 'book', 'conferencePaper', 'report', 'thesis', 'webpage')
   )
 """
-    df = pd.read_sql_query(query, conn)
+    # Every column is COALESCEd to text, so the rows go straight into a frame
+    # without read_sql_query's per-row type inference
+    cur.execute(query)
+    cols = [d[0] for d in cur.description]
+    df = pd.DataFrame.from_records(cur.fetchall(), columns=cols)
     conn.close()
 
-    out = pd.DataFrame()
-    out["title"] = df["title"].fillna("").map(_norm)
-    out["abstract"] = df["abstract"].fillna("").map(_norm)
-
-    def _norm_authors(s: str) -> str:
-        s = _norm(s)
-        if not s or s.lower() == "nan":
-            return ""
-        parts = [a.strip() for a in s.split(";") if a.strip()]
-        return "; ".join(parts)
-
-    out["authors"] = df["authors"].fillna("").map(_norm_authors)
-
-    def _norm_keywords(s: str) -> str:
-        s = _norm(s)
-        if not s or s.strip().lower() in ("nan", ""):
-            return ""
-        parts = [
-            p.strip() for p in s.split(";") if p.strip() and p.strip().lower() != "nan"
-        ]
-        return "; ".join(parts)
-
-    out["keywords"] = df["keywords"].fillna("").map(_norm_keywords)
-
-    def _norm_doi(s: str) -> str:
-        s = _norm(s)
-        if not s or s.strip().lower() in ("nan", ""):
-            return ""
-        return s
-
-    out["doi"] = df["doi"].fillna("").map(_norm_doi)
-    out["url"] = df["url"].fillna("").map(_norm)
-    out["year"] = df["year"].fillna("").map(lambda s: _guess_year(s))
+    # Column-wise string operations instead of a Python call per cell
+    out = pd.DataFrame(index=df.index)
+    out["title"] = _norm_col(df["title"])
+    out["abstract"] = _norm_col(df["abstract"])
+    out["authors"] = _norm_list_col(df["authors"])
+    # Tags named 'nan' are dropped from the keywords
+    out["keywords"] = (
+        _norm_list_col(df["keywords"])
+        .str.replace(_NAN_ENTRY_RE, "", regex=True)
+        .str.strip("; ")
+    )
+    doi = _norm_col(df["doi"])
+    out["doi"] = doi.mask(doi.str.lower() == "nan", "")
+    out["url"] = _norm_col(df["url"])
+    out["year"] = _year_col(df["year"])
 
-    out[const.ASR_LABEL_COL] = df["asreview_label"].fillna("").map(_norm)
-    out[const.ASR_TIME_COL] = df["asreview_time"].fillna("").map(_norm)
-    out[const.ASR_NOTE_COL] = df["asreview_note"].fillna("").map(_norm)
+    out[const.ASR_LABEL_COL] = _norm_col(df["asreview_label"])
+    out[const.ASR_TIME_COL] = _norm_col(df["asreview_time"])
+    out[const.ASR_NOTE_COL] = _norm_col(df["asreview_note"])
 
     # Ensure required columns exist
     for c in REQUIRED_ASR_COLS:
@@ -400,43 +504,35 @@ WHERE items.libraryID = {group_id} AND items.itemTypeID IN (
         if c not in out.columns:
             out[c] = ""
 
-    out = out.replace("nan", "", regex=False)
-
     # set asreview_label
-    out[const.ASR_LABEL_COL] = out[const.ASR_LABEL_COL].map(
-        lambda s: (
-            "1"
-            if s == const.DECISION_INCLUDED
-            else "0" if s == const.DECISION_EXCLUDED else ""
-        )
+    out[const.ASR_LABEL_COL] = (
+        out[const.ASR_LABEL_COL]
+        .map({const.DECISION_INCLUDED: "1", const.DECISION_EXCLUDED: "0"})
+        .fillna("")
     )
 
     # optional; add local file:// PDF links if available
     if local_pdf_links:
-        pdf_links = []
-        for _, row in df.iterrows():
-            item_key = row.get("item_key", "")
-            if item_key:
-                pdf_path = Path.home() / "Zotero" / "storage" / item_key
-                if pdf_path.exists() and pdf_path.is_dir():
-                    # Find first PDF file in the storage folder
-                    pdf_files = list(pdf_path.glob("*.pdf"))
-                    if pdf_files:
-                        pdf_links.append(f"file://{pdf_files[0].as_posix()}")
-                        continue
-            pdf_links.append("")
-        out["local_url"] = pdf_links
+        storage = Path.home() / "Zotero" / "storage"
+        pdfs = _local_pdfs(storage, df["item_key"])
+        out["local_url"] = (
+            df["item_key"]
+            .map(pdfs)
+            .fillna("")
+            .map(lambda p: f"file://{p}" if p else "")
+        )
 
     # Deduplicate (DOI first, else title+year fingerprint)
     if deduplicate:
-        fps = out.apply(
-            lambda r: _build_fingerprint(r["title"], r["year"], r["doi"]), axis=1
+        out = (
+            out.assign(_dedup_key=_fingerprints(out))
+            .drop_duplicates(subset="_dedup_key", keep="first", ignore_index=True)
+            .drop(columns="_dedup_key")
         )
-        out = out.loc[~fps.duplicated()].copy()
 
     out_csv.parent.mkdir(parents=True, exist_ok=True)
-    out = out.replace({np.nan: ""}, regex=False)
-    out.to_csv(out_csv, index=False, na_rep="")
+    # Written a chunk at a time, so the CSV text never exists in full in memory
+    out.to_csv(out_csv, index=False, na_rep="", chunksize=_CSV_CHUNK_ROWS)
 
 
 __all__ = ["make_asreview_csv", "make_asreview_csv_from_db"]
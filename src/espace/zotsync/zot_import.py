@@ -27,45 +27,96 @@ Werking:
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+import bisect
 from dataclasses import dataclass
+import functools
 import json
+import math
 import re
 from pathlib import Path
-import difflib
 import sqlite3
+from typing import Iterable
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from rapidfuzz import fuzz
+from rapidfuzz import process
 
 import espace.zotsync.const as const
 
+try:  # optioneel: snellere JSON-encoding van de schrijf-payloads
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:  # optioneel: multithreaded CSV-parser met Arrow-strings
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+_WS_RE = re.compile(r"\s+")
+_YEAR_RE = re.compile(r"(19|20)\d{2}")
+
+# Common encodings: 1/0, included/excluded, relevant/irrelevant, yes/no, true/false
+_LABEL_DECISIONS = {
+    **dict.fromkeys(
+        ("1", const.DECISION_INCLUDED, "relevant", "yes", "true", "y"),
+        const.DECISION_INCLUDED,
+    ),
+    **dict.fromkeys(
+        ("0", "-1", const.DECISION_EXCLUDED, "irrelevant", "no", "false", "n"),
+        const.DECISION_EXCLUDED,
+    ),
+}
+
+# Concurrent Zotero API requests (searches, write batches) per import run
+_API_WORKERS = 8
+# Attachments and notes are never the reviewed item but often share its title
+_SKIP_ITEM_TYPES = ("attachment", "note")
+# The same as a search filter: one itemType parameter, "-" negates the whole
+# "||" list ("-attachment || note": neither attachments nor notes)
+_SKIP_CHILD_ITEMS = "-" + " || ".join(_SKIP_ITEM_TYPES)
+# Maximum number of items per Zotero write request
+_WRITE_BATCH = 50
+# Maximum number of keys per itemKey read request
+_ITEM_KEY_BATCH = 50
+# Items per page when reading the whole library (Zotero API maximum)
+_PAGE_SIZE = 100
+# Bound parameters per statement in older SQLite builds (SQLITE_MAX_VARIABLE_NUMBER)
+_SQLITE_MAX_PARAMS = 999
+
 # -------------------------- helpers --------------------------
 
 
 def _norm(s: object) -> str:
     if s is None:
         return ""
-    return re.sub(r"\s+", " ", str(s)).strip()
+    return _WS_RE.sub(" ", str(s)).strip()
 
 
-def _normalize_doi(s: object) -> str:
-    """Normalize DOI for robust matching: lowercased, strip URL prefixes."""
-    raw = _norm(s).lower()
-    if not raw:
-        return ""
-    # strip common URL prefixes
-    for prefix in ("https://doi.org/", "http://doi.org/", "doi:", "doi.org/"):
-        if raw.startswith(prefix):
-            raw = raw[len(prefix) :]
-    # strip leading/trailing spaces again (in case)
-    return raw.strip()
+@functools.lru_cache(maxsize=65536)
+def _title_key(s: object) -> str:
+    """Normalized, lowercased title for comparisons.
+
+    Cached because the same Zotero titles come back from many searches.
+    """
+    return _norm(s).lower()
+
+
+def _norm_col(col: pd.Series) -> pd.Series:
+    """Vectorized `_norm` for a whole column; missing values become ''."""
+    return col.fillna("").astype(str).str.replace(_WS_RE, " ", regex=True).str.strip()
 
 
 def _guess_year(s: str) -> str:
     s = _norm(s)
     if not s:
         return ""
-    m = re.search(r"(19|20)\d{2}", s)
+    m = _YEAR_RE.search(s)
     return m.group(0) if m else ""
 
 
@@ -78,25 +129,30 @@ def _zotero_base(
 def _zotero_session(api_key: str) -> requests.Session:
     s = requests.Session()
     s.headers.update({"Zotero-API-Key": api_key, "Content-Type": "application/json"})
+    # Keep-alive pool for the many small requests to one host; retry rate limits
+    # (429, honouring Retry-After) and transient server errors
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
     return s
 
 
-def _search_by_doi(session: requests.Session, base: str, doi: str):
-    doi = _normalize_doi(doi)
-    matches = []
-    if not doi:
-        return matches
-    r = session.get(
-        f"{base}/items",
-        params={"q": doi, "qmode": "everything", "format": "json", "limit": 100},
+def _item_year(data: dict) -> str:
+    return _guess_year(
+        _norm(data.get("date", "")) or _norm(data.get("publicationYear", ""))
     )
-    if r.status_code != 200:
-        return matches
-    for it in r.json():
-        data = it.get("data", {})
-        if _normalize_doi(data.get("DOI", "")) == doi:
-            matches.append(it)
-    return matches
+
+
+def _year_matches(year: str, data: dict) -> bool:
+    """Exact-title matches only need the year to agree when both sides have one."""
+    zyear = _item_year(data)
+    return not year or not zyear or year.lower() == zyear.lower()
 
 
 def _search_by_title_year(session: requests.Session, base: str, title: str, year: str):
@@ -104,27 +160,25 @@ def _search_by_title_year(session: requests.Session, base: str, title: str, year
     results = []
     if not title:
         return results
+    # Exact title hits are few; a missed one is still found by `_search_fuzzy`
     r = session.get(
         f"{base}/items",
         params={
             "q": title,
             "qmode": "titleCreatorYear",
+            "itemType": _SKIP_CHILD_ITEMS,
             "format": "json",
-            "limit": 100,
+            "limit": 25,
         },
     )
     if r.status_code != 200:
         return results
     tl = title.lower()
-    for it in r.json():
+    for it in _json(r):
         data = it.get("data", {})
-        cand_title = _norm(data.get("title", "")).lower()
-        if cand_title == tl:
-            zyear = _guess_year(
-                _norm(data.get("date", "")) or _norm(data.get("publicationYear", ""))
-            )
-            if not year or not zyear or year.lower() == zyear.lower():
-                results.append(it)
+        cand_title = _title_key(data.get("title", ""))
+        if cand_title == tl and _year_matches(year, data):
+            results.append(it)
     return results
 
 
@@ -136,30 +190,310 @@ def _search_fuzzy(
         return []
     r = session.get(
         f"{base}/items",
-        params={"q": title, "qmode": "everything", "format": "json", "limit": 200},
+        params={
+            "q": title,
+            "qmode": "everything",
+            "itemType": _SKIP_CHILD_ITEMS,
+            "format": "json",
+            "limit": 200,
+        },
     )
     if r.status_code != 200:
         return []
-    tl = title.lower()
+    items = _json(r)
+    for it in items:
+        it.setdefault("data", {})
+    # All candidate titles are scored together instead of one fuzz.ratio call each
+    index = _TitleIndex((_title_key(it["data"].get("title", "")), it) for it in items)
+    return _fuzzy_matches(index, title.lower(), year, threshold)
+
+
+class _TitleIndex:
+    """Lowercased titles sorted by length, for fuzzy title lookups.
+
+    `fuzz.ratio` (Indel) is at most 2*min/(len_a + len_b), so only titles within
+    a length window around the query can reach a cutoff. That window is a
+    contiguous slice of the sorted titles, found with bisect, so a query scores
+    that slice instead of every title.
+    """
+
+    def __init__(self, entries: Iterable[tuple[str, object]]):
+        # title -> everything indexed under that title (items, or (itemID, key))
+        self.by_title: dict[str, list] = {}
+        for title, entry in entries:
+            if title:
+                self.by_title.setdefault(title, []).append(entry)
+        self._titles = sorted(self.by_title, key=len)
+        self._lengths = [len(t) for t in self._titles]
+
+    def fuzzy(self, title: str, cutoff: float) -> list[tuple[str, float]]:
+        """Indexed titles scoring at least `cutoff` (0-100), best first, with their score."""
+        n = len(title)
+        lo, hi = 0, len(self._titles)
+        if cutoff > 0:
+            lo = bisect.bisect_left(self._lengths, n * cutoff / (200 - cutoff) - 1e-9)
+            hi = bisect.bisect_right(self._lengths, n * (200 - cutoff) / cutoff + 1e-9)
+        if not n or lo >= hi:
+            return []
+        window = self._titles[lo:hi]
+        # One C++ call for the whole window instead of a Python loop over it
+        scores = process.cdist(
+            [title], window, scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float64
+        )[0]
+        hits = np.flatnonzero(scores >= cutoff)
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(window[i], scores[i]) for i in hits]
+
+
+def _fetch_all_items(
+    session: requests.Session, base: str, max_pages: int | None = None
+) -> list[dict] | None:
+    """All items of the library, read page by page.
+
+    The first page reports the library size (Total-Results), so the remaining
+    pages are requested concurrently. Returns None if a page fails, or if the
+    library takes more than `max_pages` pages; then nothing past the first page
+    is read.
+    """
+
+    def page(start: int) -> list[dict] | None:
+        r = session.get(
+            f"{base}/items",
+            params={"format": "json", "limit": _PAGE_SIZE, "start": start},
+        )
+        if r.status_code != 200:
+            return None
+        return _json(r)
+
+    r = session.get(
+        f"{base}/items",
+        params={"format": "json", "limit": _PAGE_SIZE, "start": 0},
+    )
+    if r.status_code != 200:
+        return None
+    items = _json(r)
+    if len(items) < _PAGE_SIZE:
+        return items
+    try:
+        total = int(r.headers.get("Total-Results", ""))
+    except ValueError:
+        total = None
+    if total is not None:
+        if max_pages is not None and math.ceil(total / _PAGE_SIZE) > max_pages:
+            return None
+        with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+            pages = list(pool.map(page, range(_PAGE_SIZE, total, _PAGE_SIZE)))
+        if any(p is None for p in pages):
+            return None
+        return items + [it for p in pages for it in p]
+    # No total known: keep reading until a short page
+    start = _PAGE_SIZE
+    while True:
+        if max_pages is not None and start >= max_pages * _PAGE_SIZE:
+            return None
+        p = page(start)
+        if p is None:
+            return None
+        items.extend(p)
+        if len(p) < _PAGE_SIZE:
+            return items
+        start += _PAGE_SIZE
+
+
+def _library_version(resp: requests.Response) -> int:
+    try:
+        return int(resp.headers.get("Last-Modified-Version", ""))
+    except ValueError:
+        return 0
+
+
+def _cached_library_items(
+    session: requests.Session, base: str, cache_file: Path
+) -> list[dict] | None:
+    """All items of the library, kept up to date in a local JSON cache.
+
+    Only items changed since the cached library version are downloaded (at most
+    50 per request, by key); deleted and trashed items are dropped. None if a
+    request fails.
+    """
+    since, items = 0, {}
+    if cache_file.exists():
+        try:
+            raw = cache_file.read_bytes()
+            cached = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            since, items = cached["version"], cached["items"]
+        except (ValueError, KeyError, TypeError):
+            since, items = 0, {}  # unreadable cache: start over
+
+    # Trashing an item changes its version but does not list it under /deleted:
+    # include the trash, so trashed items come back marked and can be dropped
+    r = session.get(
+        f"{base}/items",
+        params={"format": "versions", "since": since, "includeTrashed": 1},
+    )
+    if r.status_code != 200:
+        return None
+    version = _library_version(r)
+    changed = list(_json(r) or {})
+
+    def fetch(keys: list[str]) -> list[dict] | None:
+        resp = session.get(
+            f"{base}/items",
+            params={
+                "format": "json",
+                "itemKey": ",".join(keys),
+                "limit": len(keys),
+                "includeTrashed": 1,
+            },
+        )
+        return _json(resp) if resp.status_code == 200 else None
+
+    batches = [
+        changed[i : i + _ITEM_KEY_BATCH]
+        for i in range(0, len(changed), _ITEM_KEY_BATCH)
+    ]
+    with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+        pages = list(pool.map(fetch, batches))
+    if any(p is None for p in pages):
+        return None
+    for page in pages:
+        for it in page:
+            if (it.get("data") or {}).get("deleted"):
+                items.pop(it["key"], None)
+            else:
+                items[it["key"]] = it
+
+    if since:
+        r = session.get(f"{base}/deleted", params={"since": since})
+        if r.status_code != 200:
+            return None
+        for key in (_json(r) or {}).get("items", []):
+            items.pop(key, None)
+
+    if changed or version != since:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_bytes(_dumps({"version": version, "items": items}))
+        tmp.replace(cache_file)
+    return list(items.values())
+
+
+def _match_local(
+    index: _TitleIndex, title: str, year: str, threshold: float = 0.9
+) -> list:
+    """Same matching as `_search_by_title_year` with `_search_fuzzy` as fallback,
+    but against an in-memory library indexed by title.
+    """
+    tl = _title_key(title)
+    if not tl:
+        return []
+    results = [
+        it for it in index.by_title.get(tl, []) if _year_matches(year, it["data"])
+    ]
+    return results or _fuzzy_matches(index, tl, year, threshold)
+
+
+def _fuzzy_matches(
+    index: _TitleIndex, tl: str, year: str, threshold: float = 0.9
+) -> list:
+    """Indexed items whose title scores at least `threshold` against `tl`, best first.
+
+    A matching year adds 0.02 to the score.
+    """
+    # Anything below threshold - 0.02 can never qualify, even with the year bonus
+    cutoff = (threshold - (0.02 if year else 0.0)) * 100
     scored = []
-    for it in r.json():
-        data = it.get("data", {})
-        cand_title = _norm(data.get("title", "")).lower()
-        if not cand_title:
-            continue
-        score = difflib.SequenceMatcher(None, tl, cand_title).ratio()
-        if year:
-            zyear = _guess_year(
-                _norm(data.get("date", "")) or _norm(data.get("publicationYear", ""))
-            )
-            if zyear == year:
-                score += 0.02
-        if score >= threshold:
-            scored.append((score, it))
+    for cand_title, score in index.fuzzy(tl, cutoff):
+        for it in index.by_title[cand_title]:
+            score_it = score / 100.0
+            if year and _item_year(it["data"]) == year:
+                score_it += 0.02
+            if score_it >= threshold:
+                scored.append((score_it, it))
     scored.sort(key=lambda x: x[0], reverse=True)
     return [it for _, it in scored]
 
 
+def _json(resp: requests.Response):
+    """Decode a response body, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def _dumps(obj: object) -> bytes:
+    """Encode a request body as compact UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _patch_stale_item(session: requests.Session, base: str, item: dict) -> bool:
+    """Retry the tag update of an item that changed since it was read (412).
+
+    Rereads the item and PATCHes its current tags plus our review tags, guarded
+    by the version just read.
+    """
+    key = item.get("key")
+    r = session.get(f"{base}/items/{key}", params={"format": "json"})
+    if r.status_code != 200:
+        return False
+    fresh = _json(r) or {}
+    tags = fresh.get("data", {}).get("tags", []) or []
+    existing_tags = {t.get("tag", "") for t in tags}
+    for t in item.get("data", {}).get("tags", []) or []:
+        tag = t.get("tag", "")
+        if tag.startswith(const.TAG_PREFIX_REVIEW) and tag not in existing_tags:
+            tags.append({"tag": tag})
+            existing_tags.add(tag)
+    resp = session.patch(
+        f"{base}/items/{key}",
+        data=_dumps({"tags": tags}),
+        headers={"If-Unmodified-Since-Version": str(fresh.get("version"))},
+    )
+    return resp.status_code in (200, 204)
+
+
+def _post_items(session: requests.Session, base: str, items: list[dict]) -> list[bool]:
+    """Write item tags with POST /items, 50 per request; returns per-item success.
+
+    Only key, version and tags are sent: Zotero updates existing items in a
+    multi-object write like a PATCH, leaving the other fields alone. The batches
+    hold distinct items, so they are sent concurrently.
+    """
+
+    def post(batch: list[dict]) -> list[bool]:
+        payload = [
+            {
+                "key": it.get("key"),
+                "version": it.get("version"),
+                "tags": it.get("data", {}).get("tags", []),
+            }
+            for it in batch
+        ]
+        resp = session.post(f"{base}/items", data=_dumps(payload))
+        if resp.status_code != 200:
+            return [False] * len(batch)
+        result = _json(resp) or {}
+        done = {*result.get("successful", {}), *result.get("unchanged", {})}
+        failed = result.get("failed", {}) or {}
+        return [
+            str(i) in done
+            or (
+                (failed.get(str(i)) or {}).get("code") == 412
+                and _patch_stale_item(session, base, it)
+            )
+            for i, it in enumerate(batch)
+        ]
+
+    batches = [
+        items[start : start + _WRITE_BATCH]
+        for start in range(0, len(items), _WRITE_BATCH)
+    ]
+    with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+        return [ok for batch_ok in pool.map(post, batches) for ok in batch_ok]
+
+
 def _format_review_time(val: object) -> str:
     """Format timestamps to a human-readable form 'YYYY-MM-DD HH:MM' in local time."""
     # Treat NaN/None/empty as empty
@@ -177,6 +511,48 @@ def _format_review_time(val: object) -> str:
         return str(val)
 
 
+def _format_review_times(col: pd.Series) -> pd.Series:
+    """Vectorized `_format_review_time`.
+
+    The column is parsed in one go as ISO 8601 (what ASReview writes); only
+    non-empty values that do not parse that way go through the scalar version.
+    """
+    col = col.fillna("").astype(str)
+    out = (
+        pd.to_datetime(col, utc=True, errors="coerce", format="ISO8601")
+        .dt.tz_convert(None)
+        .dt.strftime("%Y-%m-%d %H:%M")
+    )
+    rest = out.isna() & (col.str.strip() != "")
+    out[rest] = col[rest].map(_format_review_time)
+    return out.fillna("")
+
+
+def _review_tags(r: dict, tag_cols: list[str]) -> list[str]:
+    """The review:* tags to set for one (normalized) ASReview row."""
+    time_value = r["_time"]
+    reason_value = r[const.ASR_NOTE_COL]
+    decision_value = r["_decision"]
+
+    tags_to_set = []
+    if decision_value:
+        tags_to_set.append(f"{const.REVIEW_DECISION_PREFIX}{decision_value}")
+        # Always include Time if available, regardless of decision
+        if time_value:
+            tags_to_set.append(f"{const.REVIEW_TIME_PREFIX}{time_value}")
+        # Use Reason= instead of ReasonDenied=, only if non-empty
+        if reason_value:
+            tags_to_set.append(f"{const.REVIEW_REASON_PREFIX}{reason_value}")
+    # Add tags for any columns that start with 'asreview_tag'
+    for col in tag_cols:
+        sval = r[col]
+        if pd.isna(sval) or sval == "":
+            continue
+        tag_name = col[len(const.ASR_TAG_PREFIX) :]
+        tags_to_set.append(f"{const.TAG_PREFIX_REVIEW}{tag_name}={sval}")
+    return tags_to_set
+
+
 @dataclass
 class UpdateReport:
     updated: int = 0
@@ -191,48 +567,60 @@ class UpdateReport:
         }
 
 
+def _open_sqlite(db_path: Path) -> sqlite3.Connection:
+    """Open the Zotero database once per run, with a larger page cache and mmap I/O."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA cache_size = -65536")  # 64 MiB
+    conn.execute("PRAGMA mmap_size = 268435456")  # 256 MiB
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def _sqlite_library_id(conn: sqlite3.Connection, group_id: object) -> int | None:
+    """Translate a Zotero groupID into the internal libraryID."""
+    row = conn.execute(
+        "SELECT libraryID FROM groups WHERE groupID = ?", (group_id,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _sqlite_title_index(
+    conn: sqlite3.Connection, library_db_id: int | None
+) -> _TitleIndex:
+    """Title index over the (itemID, key) of every item in the library."""
+    if library_db_id is None:
+        return _TitleIndex(())
+    # All (itemID, key, title) rows of the library in one query instead of one per item
+    rows = conn.execute(
+        """
+        SELECT i.itemID, i.key, v.value
+        FROM items i
+        JOIN itemData d ON d.itemID = i.itemID
+        JOIN fields f ON f.fieldID = d.fieldID
+        JOIN itemDataValues v ON v.valueID = d.valueID
+        WHERE i.libraryID = ? AND f.fieldName = 'title'
+        """,
+        (library_db_id,),
+    ).fetchall()
+    return _TitleIndex(
+        (_title_key(value), (item_id, key)) for item_id, key, value in rows
+    )
+
+
 def _find_items_by_title_year_sqlite(
-    db_path: Path, title: str, year: str, library_id: int, threshold: float = 0.9
+    index: _TitleIndex,
+    title: str,
+    year: str,
+    threshold: float = 0.9,
 ) -> list[dict]:
-    title = _norm(title).lower()
+    title = _title_key(title)
     if not title:
         return []
-
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-
-    cur.execute("SELECT libraryID FROM groups WHERE groupID = ?", (library_id,))
-    group = cur.fetchone()
-    if not group:
-        return []
-
-    cur.execute(
-        "SELECT itemID, key FROM items WHERE libraryID = ?", (group["libraryID"],)
-    )
-    items = cur.fetchall()
-
-    results = []
-    for item in items:
-        cur.execute(
-            """
-            SELECT value FROM itemDataValues WHERE valueID = (
-                SELECT valueID FROM itemData WHERE itemID = ? AND fieldID = (
-                    SELECT fieldID FROM fields WHERE fieldName = 'title'
-                ) LIMIT 1
-            )
-        """,
-            (item["itemID"],),
-        )
-        row = cur.fetchone()
-        if not row:
-            continue
-        cand_title = _norm(row["value"]).lower()
-        score = difflib.SequenceMatcher(None, title, cand_title).ratio()
-        if score >= threshold:
-            results.append({"key": item["key"], "score": score})
-    conn.close()
-    return sorted(results, key=lambda x: x["score"], reverse=True)
+    return [
+        {"itemID": item_id, "key": key, "score": score / 100.0}
+        for cand_title, score in index.fuzzy(title, threshold * 100)
+        for item_id, key in index.by_title[cand_title]
+    ]
 
 
 # -------------------------- core API --------------------------
@@ -247,6 +635,7 @@ def apply_asreview_decisions(
     dry_run: bool = False,
     zotero_host: str = "http://localhost:23119",
     db_path: Path | None = const.DEFAULT_SQLITE_PATH,
+    cache_dir: Path | None = None,
 ) -> dict:
     """
     Schrijf ASReview-beslissingen terug naar Zotero als tags.
@@ -261,6 +650,9 @@ def apply_asreview_decisions(
 
     zotero_host: base URL van de Zotero instantie (default: http://localhost:23119)
 
+    cache_dir: (optioneel) map voor een lokale kopie van de bibliotheek (API-pad); latere
+    runs halen alleen de sindsdien gewijzigde items op in plaats van te zoeken.
+
     Als `db_path` is opgegeven, wordt alleen gezocht in de lokale Zotero SQLite-database en geen wijzigingen doorgevoerd (alleen telling van matches).
 
     Returns: dict met aantallen {updated, not_found, errors}.
@@ -271,182 +663,204 @@ def apply_asreview_decisions(
     if asr_csv is None or not asr_csv.exists():
         raise FileNotFoundError(f"ASReview CSV not found at: {asr_csv}")
 
-    df = pd.read_csv(asr_csv)
-
-    df[const.ASR_LABEL_COL] = df.get(const.ASR_LABEL_COL, "")
-    df[const.ASR_TIME_COL] = df.get(const.ASR_TIME_COL, "")
-    df[const.ASR_NOTE_COL] = df.get(const.ASR_NOTE_COL, "")
-
-    if "title" in df.columns:
-        df["title"] = df["title"].map(_norm)
-    else:
-        df["title"] = ""
-
-    if "year" in df.columns:
-        df["year"] = df["year"].map(lambda x: _norm(x) or "")
-    else:
-        df["year"] = ""
+    # Read every column as text: skips dtype inference and keeps values such as
+    # years and labels as written (no 2020 -> 2020.0 when a column has gaps).
+    # Only the columns used below are read; abstracts and the like are skipped.
+    wanted = {"title", "year", const.ASR_LABEL_COL, const.ASR_TIME_COL}
+    wanted.add(const.ASR_NOTE_COL)
+    # The pyarrow engine needs the column names up front (no callable usecols)
+    header = pd.read_csv(asr_csv, nrows=0).columns
+    df = pd.read_csv(
+        asr_csv,
+        dtype=str,
+        keep_default_na=False,
+        usecols=[
+            c for c in header if c in wanted or c.startswith(const.ASR_TAG_PREFIX)
+        ],
+        engine="pyarrow" if pyarrow is not None else "c",
+    )
 
-    if "doi" in df.columns:
-        df["doi"] = df["doi"].map(_normalize_doi)
+    # Normalize all matching and decision fields column-wise up front
+    # (the doi column is not read: matching goes by title and year only)
+    for col in ("title", "year", const.ASR_NOTE_COL):
+        df[col] = _norm_col(df[col]) if col in df.columns else ""
+    if const.ASR_LABEL_COL in df.columns:
+        df["_decision"] = (
+            _norm_col(df[const.ASR_LABEL_COL]).str.lower().map(_LABEL_DECISIONS)
+        ).fillna("")
     else:
-        df["doi"] = ""
-
-    def label_to_decision(v: object) -> str | None:
-        s = _norm(v).lower()
-        if not s:
-            return None
-        # Common encodings: 1/0, included/excluded, relevant/irrelevant, yes/no, true/false
-        if s in {"1", const.DECISION_INCLUDED, "relevant", "yes", "true", "y"}:
-            return const.DECISION_INCLUDED
-        if s in {"0", "-1", const.DECISION_EXCLUDED, "irrelevant", "no", "false", "n"}:
-            return const.DECISION_EXCLUDED
-        return None
+        df["_decision"] = ""
+    df["_time"] = _format_review_times(
+        df[const.ASR_TIME_COL]
+        if const.ASR_TIME_COL in df.columns
+        else pd.Series("", index=df.index)
+    )
+    tag_cols = [col for col in df.columns if col.startswith(const.ASR_TAG_PREFIX)]
 
     session = _zotero_session(api_key)
     base = _zotero_base(library_type, library_id, host=zotero_host)
 
     report = UpdateReport()
     use_sqlite = db_path is not None
+    if use_sqlite:
+        # One connection and one groupID -> libraryID lookup for the whole run
+        conn = _open_sqlite(db_path)
+        # Library titles are read and indexed once, not again for every row
+        title_index = _sqlite_title_index(conn, _sqlite_library_id(conn, library_id))
+        # tag name -> tagID; decision tags repeat across many rows
+        tag_id_by_name: dict[str, int] = {}
+
+    # Zotero key -> [item, number of rows that matched it], for the API path
+    pending: dict[str, list] = {}
+
+    # Plain dicts instead of iterrows(), which builds a Series per row; only
+    # the columns the loop reads
+    row_cols = ["title", "year", "_time", const.ASR_NOTE_COL, "_decision", *tag_cols]
+    rows = df[row_cols].to_dict("records")
+
+    row_tags = [_review_tags(r, tag_cols) for r in rows]
+
+    # (title, year) -> matched Zotero items, for the API path. The same paper
+    # often appears more than once in an export, so each distinct title is
+    # matched once.
+    search_cache: dict[tuple[str, str], list] = {}
+    if not use_sqlite:
+        # Rows without tags are skipped unless this is a dry run: don't search them
+        keys = list(
+            dict.fromkeys(
+                (r["title"], r["year"])
+                for r, tags_to_set in zip(rows, row_tags)
+                if tags_to_set or dry_run
+            )
+        )
+        # Reading the whole library pays off when it takes no more pages than
+        # there are titles to search (one request each); the first page tells
+        # the library size. With a cache only the changes are downloaded, so
+        # it is always used.
+        if cache_dir is not None:
+            library = _cached_library_items(
+                session, base, Path(cache_dir) / f"{library_type}-{library_id}.json"
+            )
+        elif keys:
+            library = _fetch_all_items(session, base, max_pages=len(keys))
+        else:
+            library = None
+        if library is not None:
+            for it in library:
+                it.setdefault("data", {})
+            # Same exclusion as the searches: a PDF named after the paper must
+            # not be tagged instead of the paper itself
+            library_index = _TitleIndex(
+                (_title_key(it["data"].get("title", "")), it)
+                for it in library
+                if it["data"].get("itemType") not in _SKIP_ITEM_TYPES
+            )
+            search_cache = {
+                key: _match_local(library_index, *key, threshold=fuzzy_threshold)
+                for key in keys
+            }
+        else:
+            # Separate searches are independent network calls: run them concurrently
+            def search(key: tuple[str, str]) -> list:
+                title, year = key
+                matches = _search_by_title_year(session, base, title, year)
+                return matches or _search_fuzzy(
+                    session, base, title, year, threshold=fuzzy_threshold
+                )
 
-    for _, r in df.iterrows():
-        title = _norm(r.get("title", ""))
-        year = _norm(r.get("year", ""))
-        # doi is not used for matching anymore per updated docstring, but keep it normalized anyway
-        # doi = _norm(r.get("doi", "").lower())
+            with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+                search_cache = dict(zip(keys, pool.map(search, keys)))
 
-        time_value = _format_review_time(r.get(const.ASR_TIME_COL, ""))
-        raw_reason = r.get(const.ASR_NOTE_COL, "")
-        try:
-            reason_value = "" if pd.isna(raw_reason) else _norm(raw_reason)
-        except Exception:
-            reason_value = _norm(raw_reason)
-
-        decision_value = label_to_decision(r.get(const.ASR_LABEL_COL, ""))
-
-        tags_to_set = []
-        if decision_value:
-            tags_to_set.append(f"{const.REVIEW_DECISION_PREFIX}{decision_value}")
-            # Always include Time if available, regardless of decision
-            if time_value:
-                tags_to_set.append(f"{const.REVIEW_TIME_PREFIX}{time_value}")
-            # Use Reason= instead of ReasonDenied=, only if non-empty
-            if reason_value:
-                tags_to_set.append(f"{const.REVIEW_REASON_PREFIX}{reason_value}")
-        # Add tags for any columns that start with 'asreview_tag'
-        for col in df.columns:
-            if col.startswith(const.ASR_TAG_PREFIX):
-                sval = r.get(col, "")
-                if pd.isna(sval) or sval == "":
-                    continue
-                tag_name = col[len(const.ASR_TAG_PREFIX) :]
-                tags_to_set.append(f"{const.TAG_PREFIX_REVIEW}{tag_name}={sval}")
+    for r, tags_to_set in zip(rows, row_tags):
+        title = r["title"]
+        year = r["year"]
 
         # Zoek items (alle matches)
         if use_sqlite:
             items = _find_items_by_title_year_sqlite(
-                db_path, title, year, library_id, threshold=fuzzy_threshold
+                title_index, title, year, threshold=fuzzy_threshold
             )
             if len(items) == 0:
                 report.not_found += 1
                 continue
             if not tags_to_set:
                 continue
-            import sqlite3
-
-            conn = sqlite3.connect(db_path)
             cur = conn.cursor()
-            for match in items:
-                key = match["key"]
-                cur.execute("SELECT itemID FROM items WHERE key = ?", (key,))
-                row = cur.fetchone()
-                if not row:
-                    report.errors += 1
-                    continue
-                item_id = row[0]
-                # Verwijder bestaande review:* tags
-                cur.execute(
-                    """
-                    SELECT tagID FROM tags WHERE name LIKE ?
-                    AND tagID IN (SELECT tagID FROM itemTags WHERE itemID = ?)
+            item_ids = [match["itemID"] for match in items]
+            # Verwijder bestaande review:* tags
+            cur.executemany(
+                """
+                DELETE FROM itemTags WHERE itemID = ?
+                AND tagID IN (SELECT tagID FROM tags WHERE name LIKE ?)
                 """,
-                    (f"{const.TAG_PREFIX_REVIEW}%", item_id),
-                )
-                tag_ids = [row[0] for row in cur.fetchall()]
-                for tag_id in tag_ids:
-                    cur.execute(
-                        "DELETE FROM itemTags WHERE itemID = ? AND tagID = ?",
-                        (item_id, tag_id),
-                    )
-                for tag in tags_to_set:
+                [(item_id, f"{const.TAG_PREFIX_REVIEW}%") for item_id in item_ids],
+            )
+            tag_ids = []
+            for tag in tags_to_set:
+                tag_id = tag_id_by_name.get(tag)
+                if tag_id is None:
                     # Check of tag al bestaat
                     cur.execute("SELECT tagID FROM tags WHERE name = ?", (tag,))
                     row = cur.fetchone()
                     if row:
                         tag_id = row[0]
                     else:
-                        # Bepaal nieuwe unieke tagID
-                        cur.execute("SELECT MAX(tagID) FROM tags")
-                        max_id = cur.fetchone()[0]
-                        tag_id = (max_id or 0) + 1
-                        cur.execute(
-                            "INSERT INTO tags (tagID, name) VALUES (?, ?)",
-                            (
-                                tag_id,
-                                tag,
-                            ),
-                        )
-                    cur.execute(
-                        "INSERT OR IGNORE INTO itemTags (itemID, tagID, type) VALUES (?, ?, ?)",
-                        (item_id, tag_id, 0),
-                    )
-                report.updated += 1
-            conn.commit()
-            conn.close()
+                        # tagID is een INTEGER PRIMARY KEY (rowid): SQLite kent zelf een nieuwe toe
+                        cur.execute("INSERT INTO tags (name) VALUES (?)", (tag,))
+                        tag_id = cur.lastrowid
+                    tag_id_by_name[tag] = tag_id
+                tag_ids.append(tag_id)
+            cur.executemany(
+                "INSERT OR IGNORE INTO itemTags (itemID, tagID, type) VALUES (?, ?, 0)",
+                [(item_id, tag_id) for item_id in item_ids for tag_id in tag_ids],
+            )
+            report.updated += len(item_ids)
             continue
-        else:
-            ty_matches = _search_by_title_year(session, base, title, year)
-            if ty_matches:
-                items = ty_matches
-            else:
-                items = _search_fuzzy(
-                    session, base, title, year, threshold=fuzzy_threshold
-                )
 
         if not tags_to_set and not dry_run:
-            # No tags to set and not dry run, skip update but count as not found?
-            # The instructions say skip update if tags_to_set is empty and dry_run is False,
-            # but still count not_found if no matched items.
-            # Here we have matches but no tags to set, so just continue without update or counting not_found.
+            # No tags to set and not dry run: skip the row (it was not searched either),
+            # without counting it as updated or not found.
             continue
+        items = search_cache[(title, year)]
 
         if dry_run:
             report.updated += len(items)
             continue
 
         for item in items:
-            key = item.get("key")
-            ver = item.get("version")
+            # Another row may already have matched this key, through its own search
+            # result: add to that copy, as it is the one that gets written
+            if item.get("key") in pending:
+                item = pending[item.get("key")][0]
             data = item.get("data", {})
             tags = data.get("tags", []) or []
+            existing_tags = {t.get("tag", "") for t in tags}
+            missing = [t for t in tags_to_set if t not in existing_tags]
+            if not missing and item.get("key") not in pending:
+                # Item already carries every tag (e.g. a rerun): nothing to write
+                report.updated += 1
+                continue
 
-            def ensure_tag(tag: str):
-                if not any(t.get("tag", "") == tag for t in tags):
-                    tags.append({"tag": tag})
-
-            for t in tags_to_set:
-                ensure_tag(t)
+            for t in dict.fromkeys(missing):
+                tags.append({"tag": t})
 
             data["tags"] = tags
-            resp = session.put(
-                f"{base}/items/{key}",
-                data=json.dumps({"key": key, "version": ver, "data": data}),
-            )
-            if resp.status_code in (200, 204):
-                report.updated += 1
+            # Collect per item; every item is written once after the loop
+            pending.setdefault(item.get("key"), [item, 0])[1] += 1
+
+    if pending:
+        entries = list(pending.values())
+        written = _post_items(session, base, [item for item, _ in entries])
+        for (_, n_rows), ok in zip(entries, written):
+            if ok:
+                report.updated += n_rows
             else:
-                report.errors += 1
+                report.errors += n_rows
 
+    if use_sqlite:
+        # Alle SQLite-wijzigingen in één transactie
+        conn.commit()
+        conn.close()
     return report.to_dict()
 
 
@@ -509,34 +923,45 @@ def remove_review_tags(
             if not tag_ids:
                 conn.close()
                 return {"removed": 0, "errors": 0}
-            # Zoek alle itemTags met deze tagIDs en JOIN met items
-            cur.execute(
-                f"""
-                SELECT it.itemID, it.tagID
-                FROM itemTags it
-                JOIN items i ON it.itemID = i.itemID
-                WHERE it.tagID IN ({','.join(['?']*len(tag_ids))}) AND i.libraryID = ?
-                """,
-                (tag_ids + [group[0]]),
-            )
-            rows = cur.fetchall()
+            # Per blok tagIDs (SQLite staat maximaal 999 parameters toe): één
+            # COUNT, en zonder dry-run één DELETE voor de itemTags van deze
+            # library en één voor de tags die nergens meer worden gebruikt
+            library_db_id = group[0]
+            chunks = [
+                tag_ids[i : i + _SQLITE_MAX_PARAMS - 1]
+                for i in range(0, len(tag_ids), _SQLITE_MAX_PARAMS - 1)
+            ]
+            in_library = "itemID IN (SELECT itemID FROM items WHERE libraryID = ?)"
+            total = 0
+            for chunk in chunks:
+                marks = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"SELECT COUNT(*) FROM itemTags WHERE tagID IN ({marks}) AND {in_library}",
+                    (*chunk, library_db_id),
+                )
+                total += cur.fetchone()[0]
             if dry_run:
                 conn.close()
-                return {"removed": len(rows), "errors": 0}
-            # Verwijder deze itemTags en verwijder de tag uit tags als hij nergens meer wordt gebruikt
-            for item_id, tag_id in rows:
-                try:
+                return {"removed": total, "errors": 0}
+            # Alles in één transactie
+            try:
+                for chunk in chunks:
+                    marks = ",".join("?" * len(chunk))
                     cur.execute(
-                        "DELETE FROM itemTags WHERE itemID = ? AND tagID = ?",
-                        (item_id, tag_id),
+                        f"DELETE FROM itemTags WHERE tagID IN ({marks}) AND {in_library}",
+                        (*chunk, library_db_id),
                     )
+                    removed += cur.rowcount
                     cur.execute(
-                        "DELETE FROM tags WHERE tagID = ? AND NOT EXISTS (SELECT 1 FROM itemTags WHERE tagID = ?)",
-                        (tag_id, tag_id),
+                        f"""
+                        DELETE FROM tags WHERE tagID IN ({marks})
+                          AND NOT EXISTS (SELECT 1 FROM itemTags it WHERE it.tagID = tags.tagID)
+                        """,
+                        chunk,
                     )
-                    removed += 1
-                except Exception:
-                    errors += 1
+            except sqlite3.Error:
+                conn.rollback()
+                removed, errors = 0, total
             conn.commit()
         finally:
             conn.close()
@@ -544,47 +969,55 @@ def remove_review_tags(
     # 2. Zotero API pad
     session = _zotero_session(api_key)
     base = _zotero_base(library_type, library_id, host=zotero_host)
+
+    def put(update: tuple[str, object, dict]) -> bool:
+        key, ver, data = update
+        resp = session.put(
+            f"{base}/items/{key}",
+            data=_dumps({"key": key, "version": ver, "data": data}),
+        )
+        return resp.status_code in (200, 204)
+
     try:
-        # Haal alle items op, paginering indien nodig (max 100 per keer)
+        # Haal alle items op, paginering indien nodig (max 100 per keer); de
+        # PUTs van een pagina gaan gelijktijdig over de gedeelde sessie
         start = 0
         per_page = 100
-        while True:
-            r = session.get(
-                f"{base}/items",
-                params={"format": "json", "limit": per_page, "start": start},
-            )
-            if r.status_code != 200:
-                errors += 1
-                break
-            items = r.json()
-            if not items:
-                break
-            for item in items:
-                key = item.get("key")
-                ver = item.get("version")
-                data = item.get("data", {})
-                tags = data.get("tags", []) or []
-                orig_len = len(tags)
-                # Verwijder alle tags met prefix tag_prefix
-                tags_new = [
-                    t for t in tags if not t.get("tag", "").startswith(tag_prefix)
-                ]
-                if len(tags_new) < orig_len:
-                    if dry_run:
-                        removed += orig_len - len(tags_new)
-                        continue
-                    data["tags"] = tags_new
-                    resp = session.put(
-                        f"{base}/items/{key}",
-                        data=json.dumps({"key": key, "version": ver, "data": data}),
-                    )
-                    if resp.status_code in (200, 204):
-                        removed += orig_len - len(tags_new)
+        with ThreadPoolExecutor(max_workers=_API_WORKERS) as pool:
+            while True:
+                r = session.get(
+                    f"{base}/items",
+                    params={"format": "json", "limit": per_page, "start": start},
+                )
+                if r.status_code != 200:
+                    errors += 1
+                    break
+                items = _json(r)
+                if not items:
+                    break
+                updates, counts = [], []
+                for item in items:
+                    data = item.get("data", {})
+                    tags = data.get("tags", []) or []
+                    # Verwijder alle tags met prefix tag_prefix
+                    tags_new = [
+                        t for t in tags if not t.get("tag", "").startswith(tag_prefix)
+                    ]
+                    if len(tags_new) < len(tags):
+                        if dry_run:
+                            removed += len(tags) - len(tags_new)
+                            continue
+                        data["tags"] = tags_new
+                        updates.append((item.get("key"), item.get("version"), data))
+                        counts.append(len(tags) - len(tags_new))
+                for ok, n in zip(pool.map(put, updates), counts):
+                    if ok:
+                        removed += n
                     else:
                         errors += 1
-            if len(items) < per_page:
-                break
-            start += per_page
+                if len(items) < per_page:
+                    break
+                start += per_page
     except Exception:
         errors += 1
     return {"removed": removed, "errors": errors}
@@ -10,8 +10,11 @@ Also respects explicit DOTENV_PATH if set.
 from __future__ import annotations
 
 import os
+import sqlite3
 from pathlib import Path
 
+import pytest
+
 try:
     from dotenv import load_dotenv  # type: ignore
 except ImportError:  # pragma: no cover
@@ -69,3 +72,18 @@ def pytest_configure(config):
             "ZOTERO_API_KEY set=",
             bool(os.getenv("ZOTERO_API_KEY")),
         )
+
+
+@pytest.fixture()
+def sqlite_db(tmp_path: Path, sqlite_template: sqlite3.Connection) -> Path:
+    """Per-test copy of the module's `sqlite_template` at tmp_path/zotero.sqlite.
+
+    Each test module defines its own `sqlite_template` (an in-memory database
+    built once); copying it with `Connection.backup` skips the SQL entirely.
+    """
+    db_path = tmp_path / "zotero.sqlite"
+    dest = sqlite3.connect(db_path)
+    dest.execute("PRAGMA synchronous = OFF")  # durability is irrelevant here
+    sqlite_template.backup(dest)
+    dest.close()
+    return db_path
@@ -1,6 +1,6 @@
-"""CLI smoke test for Typer app."""
+"""CLI smoke test for the Click app."""
 
-from typer.testing import CliRunner
+from click.testing import CliRunner
 from espace.zotsync.__main__ import app
 
 
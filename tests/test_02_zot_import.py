@@ -19,15 +19,24 @@ import espace.zotsync.const as const
 
 class _FakeResponse:
     def __init__(
-        self, status_code: int = 200, data: Any | None = None, text: str = ""
+        self,
+        status_code: int = 200,
+        data: Any | None = None,
+        text: str = "",
+        headers: Dict[str, str] | None = None,
     ) -> None:
         self.status_code = status_code
         self._data = data
         self.text = text
+        self.headers = headers or {}
 
-    # emulate requests.Response.json()
+    # emulate requests.Response.json() and .content: every decode is a new object
     def json(self) -> Any:
-        return self._data
+        return json.loads(self.content)
+
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._data).encode("utf-8")
 
 
 class _FakeSession:
@@ -36,28 +45,101 @@ class _FakeSession:
     def __init__(self, items_index: Dict[str, Dict[str, Any]]):
         # items_index maps query key -> list of items
         self.items_index = items_index
-        self.put_calls: List[Dict[str, Any]] = []
+        self.post_calls: List[Dict[str, Any]] = []
+        # item payloads of all POST /items writes, in order
+        self.written: List[Dict[str, Any]] = []
+        self.get_calls: List[Dict[str, Any]] = []
+        # keys whose POST write fails with 412 (changed on the server meanwhile)
+        self.stale_keys: set = set()
+        self.patch_calls: List[Dict[str, Any]] = []
 
     def get(self, url: str, params: Dict[str, Any] | None = None):
+        self.get_calls.append({"url": url, "params": params})
         # We only care about .../items queries with q / qmode
+        everything = list(
+            {it["key"]: it for v in self.items_index.values() for it in v}.values()
+        )
+        library_version = max(it["version"] for it in everything)
+        if not (params or {}).get("includeTrashed"):
+            # items in the trash are left out unless asked for
+            everything = [it for it in everything if not it["data"].get("deleted")]
+        if url.endswith("/deleted"):
+            return _FakeResponse(200, {"items": []})
+        if url.endswith("/items") and (params or {}).get("format") == "versions":
+            # keys and versions of the items changed since a library version
+            since = params.get("since", 0)
+            return _FakeResponse(
+                200,
+                {
+                    it["key"]: it["version"]
+                    for it in everything
+                    if it["version"] > since
+                },
+                headers={"Last-Modified-Version": str(library_version)},
+            )
+        if url.endswith("/items") and "itemKey" in (params or {}):
+            keys = params["itemKey"].split(",")
+            return _FakeResponse(200, [it for it in everything if it["key"] in keys])
         if url.endswith("/items"):
+            if "q" not in (params or {}):
+                # paged listing of the whole library
+                start, limit = params.get("start", 0), params.get("limit", 25)
+                return _FakeResponse(
+                    200,
+                    everything[start : start + limit],
+                    headers={"Total-Results": str(len(everything))},
+                )
             q = (params or {}).get("q", "")
             # Return list for the query if present, else empty
             data = self.items_index.get(q, [])
             if not data:
                 data = self.items_index.get(q.lower(), [])
+            data = [it for it in data if it in everything]
+            item_type = params.get("itemType")
+            if item_type is not None:
+                # Zotero accepts a single itemType ("-a || b" excludes both)
+                assert isinstance(item_type, str), item_type
+                negate = item_type.startswith("-")
+                types = {t.strip() for t in item_type.lstrip("-").split("||")}
+                data = [
+                    it for it in data if (it["data"].get("itemType") in types) != negate
+                ]
             return _FakeResponse(200, data)
+        # single item, as reread after a version conflict
+        for items in self.items_index.values():
+            for it in items:
+                if url.endswith(f"/items/{it['key']}"):
+                    return _FakeResponse(200, {**it, "version": it["version"] + 1})
         # Children not used here
         return _FakeResponse(404, text="not found")
 
-    def put(self, url: str, data: str = ""):
-        # record payload and pretend success
-        try:
-            payload = json.loads(data)
-        except Exception:  # pragma: no cover - defensive
-            payload = {"raw": data}
-        self.put_calls.append({"url": url, "payload": payload})
-        return _FakeResponse(200)
+    def post(self, url: str, data: str = ""):
+        # record the batch and report every item as written, except stale ones
+        payload = json.loads(data)
+        self.post_calls.append({"url": url, "payload": payload})
+        result: Dict[str, Dict[str, Any]] = {
+            "successful": {},
+            "unchanged": {},
+            "failed": {},
+        }
+        for i, obj in enumerate(payload):
+            if obj["key"] in self.stale_keys:
+                result["failed"][str(i)] = {"key": obj["key"], "code": 412}
+            else:
+                self.written.append(obj)
+                result["successful"][str(i)] = obj
+                # store the new tags, as the server would
+                for items in self.items_index.values():
+                    for it in items:
+                        if it["key"] == obj["key"]:
+                            it["data"]["tags"] = obj["tags"]
+        return _FakeResponse(200, result)
+
+    def patch(self, url: str, data: str = "", headers: Dict[str, str] | None = None):
+        self.patch_calls.append(
+            {"url": url, "payload": json.loads(data), "headers": headers}
+        )
+        return _FakeResponse(204)
 
 
 @pytest.fixture()
@@ -99,6 +181,23 @@ def fake_env(monkeypatch):
     return fake
 
 
+@pytest.fixture()
+def big_library(fake_env: _FakeSession, monkeypatch) -> _FakeSession:
+    """De bibliotheek van `fake_env`, aangevuld tot meer pagina's dan er titels zijn.
+
+    Zoeken per titel is dan goedkoper dan de hele bibliotheek lezen.
+    """
+    import espace.zotsync.zot_import as m
+
+    monkeypatch.setattr(m, "_PAGE_SIZE", 1)
+    # Items zonder titel: worden nooit gevonden, tellen alleen mee in Total-Results
+    fake_env.items_index[""] = [
+        {"key": f"FILL{i}", "version": 1, "data": {"title": "", "tags": []}}
+        for i in range(10)
+    ]
+    return fake_env
+
+
 @pytest.fixture()
 def asr_csv_tmp(tmp_path: Path) -> Path:
     """Create a minimal review export CSV for tests."""
@@ -137,7 +236,7 @@ def test_zot_import_dry_run(fake_env: _FakeSession, asr_csv_tmp: Path):
     assert res["updated"] == 2
     assert res["not_found"] == 0
     assert res["errors"] == 0
-    assert fake_env.put_calls == []
+    assert fake_env.written == []
 
 
 def test_zot_import_updates_and_tags(fake_env: _FakeSession, asr_csv_tmp: Path):
@@ -150,15 +249,16 @@ def test_zot_import_updates_and_tags(fake_env: _FakeSession, asr_csv_tmp: Path):
         db_path=None,
     )
 
-    # One PUT per matched item (we have 2 rows)
+    # Both matched items written in one batched POST (we have 2 rows)
     assert res["updated"] == 2
     assert res["not_found"] == 0
     assert res["errors"] == 0
-    assert len(fake_env.put_calls) == 2
+    assert len(fake_env.post_calls) == 1
+    assert len(fake_env.written) == 2
 
     # Check that tags are present in payload
-    payload1 = fake_env.put_calls[0]["payload"]["data"]["tags"]
-    payload2 = fake_env.put_calls[1]["payload"]["data"]["tags"]
+    payload1 = fake_env.written[0]["tags"]
+    payload2 = fake_env.written[1]["tags"]
 
     def tags_to_set(tags_list):
         return {t.get("tag") for t in tags_list}
@@ -177,13 +277,15 @@ def test_zot_import_updates_and_tags(fake_env: _FakeSession, asr_csv_tmp: Path):
     assert "review:Reason=out of scope" in s2
 
 
-# Test: dry-run with a sqlite db
-def test_zot_import_dry_run_sqlite(asr_csv_tmp: Path, tmp_path: Path):
-    # Setup: kopieer een minimale Zotero sqlite database naar tmp_path
-    db_path = tmp_path / "zotero.sqlite"
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.executescript(
+@pytest.fixture(scope="module")
+def sqlite_template():
+    """Maak een minimale Zotero sqlite database met twee items in groep 123.
+
+    Eén keer per module in het geheugen opgebouwd; tests krijgen een kopie
+    via de fixture `sqlite_db` (conftest.py).
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
         """
         CREATE TABLE libraries (libraryID INTEGER);
         INSERT INTO libraries (libraryID) VALUES (1);
@@ -191,7 +293,10 @@ def test_zot_import_dry_run_sqlite(asr_csv_tmp: Path, tmp_path: Path):
         CREATE TABLE groups (groupID INTEGER, libraryID INTEGER, name TEXT);
         INSERT INTO groups (groupID, libraryID, name) VALUES (123, 1, 'Group 1');
 
-        CREATE TABLE items (itemID INTEGER PRIMARY KEY, libraryID INTEGER, key TEXT);
+        CREATE TABLE items (
+            itemID INTEGER PRIMARY KEY, libraryID INTEGER, key TEXT,
+            UNIQUE (libraryID, key)
+        );
         INSERT INTO items (itemID, libraryID, key)
             VALUES (100, 1, 'ABCD1'),
                 (101, 1, 'WXYZ2');
@@ -204,19 +309,32 @@ def test_zot_import_dry_run_sqlite(asr_csv_tmp: Path, tmp_path: Path):
             VALUES (1, 'has doi'),
                 (2, 'no doi title');
 
-        CREATE TABLE itemData (itemID INTEGER, fieldID INTEGER, valueID INTEGER);
+        CREATE TABLE itemData (
+            itemID INTEGER, fieldID INTEGER, valueID INTEGER,
+            PRIMARY KEY (itemID, fieldID)
+        );
         INSERT INTO itemData (itemID, fieldID, valueID)
             VALUES (100, 1, 1),
                 (101, 1, 2);
 
         -- Nieuwe tabellen voor review-tags
-        CREATE TABLE tags (tagID INTEGER PRIMARY KEY, name TEXT);
-        CREATE TABLE itemTags (itemID INTEGER, tagID INTEGER, type INTEGER);
+        CREATE TABLE tags (tagID INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE itemTags (
+            itemID INTEGER, tagID INTEGER, type INTEGER,
+            PRIMARY KEY (itemID, tagID)
+        );
+        CREATE INDEX itemTags_tagID ON itemTags(tagID);
     """
     )
-    conn.commit()
+    yield conn
     conn.close()
 
+
+# Test: dry-run with a sqlite db
+def test_zot_import_dry_run_sqlite(asr_csv_tmp: Path, sqlite_db: Path):
+    # Setup: kopieer een minimale Zotero sqlite database naar tmp_path
+    db_path = sqlite_db
+
     from espace.zotsync.zot_import import apply_asreview_decisions
 
     res = apply_asreview_decisions(
@@ -234,6 +352,40 @@ def test_zot_import_dry_run_sqlite(asr_csv_tmp: Path, tmp_path: Path):
     assert res["errors"] == 0
 
 
+def test_zot_import_writes_review_tags_sqlite(asr_csv_tmp: Path, sqlite_db: Path):
+    db_path = sqlite_db
+
+    # Twee keer importeren: bestaande review-tags worden vervangen, niet verdubbeld
+    for _ in range(2):
+        res = apply_asreview_decisions(
+            asr_csv=asr_csv_tmp,
+            api_key="unused",
+            library_id="123",
+            library_type="groups",
+            db_path=db_path,
+        )
+        assert res == {"updated": 2, "not_found": 0, "errors": 0}
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        """
+        SELECT i.key, t.name FROM itemTags it
+        JOIN items i ON i.itemID = it.itemID
+        JOIN tags t ON t.tagID = it.tagID
+        """
+    ).fetchall()
+    conn.close()
+
+    assert sorted(rows) == [
+        ("ABCD1", "review:Decision=included"),
+        ("ABCD1", "review:Reason=looks relevant"),
+        ("ABCD1", "review:Time=2025-09-07 10:00"),
+        ("WXYZ2", "review:Decision=excluded"),
+        ("WXYZ2", "review:Reason=out of scope"),
+        ("WXYZ2", "review:Time=2025-09-07 10:05"),
+    ]
+
+
 def test_zot_import_adds_asreview_tag_columns(fake_env: _FakeSession, tmp_path: Path):
     # Create a CSV with extra ASReview tag columns. Only columns starting with
     # 'asreview_tag' should be converted to review:<name>=<value> (prefix removed).
@@ -265,13 +417,13 @@ def test_zot_import_adds_asreview_tag_columns(fake_env: _FakeSession, tmp_path:
         db_path=None,
     )
 
-    # Expect exactly one update and one PUT call recorded
+    # Expect exactly one update and one written item
     assert res["updated"] == 1
     assert res["not_found"] == 0
     assert res["errors"] == 0
-    assert len(fake_env.put_calls) >= 1
+    assert len(fake_env.written) == 1
 
-    payload = fake_env.put_calls[-1]["payload"]["data"]["tags"]
+    payload = fake_env.written[-1]["tags"]
     tag_set = {t.get("tag") for t in payload}
 
     # Check that the prefix is removed and values are propagated
@@ -279,3 +431,336 @@ def test_zot_import_adds_asreview_tag_columns(fake_env: _FakeSession, tmp_path:
     assert "review:priority=high" in tag_set
     # Empty value should not yield a tag
     assert not any(t.startswith("review:empty=") for t in tag_set)
+
+
+def test_zot_import_searches_repeated_title_once(
+    big_library: _FakeSession, tmp_path: Path
+):
+    df = pd.DataFrame(
+        [
+            {"title": "has doi", "year": "2020", const.ASR_LABEL_COL: 1},
+            {"title": "has doi", "year": "2020", const.ASR_LABEL_COL: 1},
+        ]
+    )
+    p = tmp_path / "asr_repeated.csv"
+    df.to_csv(p, index=False)
+
+    res = apply_asreview_decisions(
+        asr_csv=p,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res["updated"] == 2
+    searches = [call for call in big_library.get_calls if "q" in call["params"]]
+    assert len(searches) == 1
+    # The item is written once, with the version it was read at
+    assert [(it["key"], it["version"]) for it in big_library.written] == [("ABCD1", 10)]
+
+
+def test_zot_import_matches_locally_for_many_titles(
+    fake_env: _FakeSession, asr_csv_tmp: Path, monkeypatch
+):
+    import espace.zotsync.zot_import as m
+
+    # Two titles, two pages: the library is read once, no searches
+    monkeypatch.setattr(m, "_PAGE_SIZE", 1)
+
+    res = apply_asreview_decisions(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    assert all("q" not in call["params"] for call in fake_env.get_calls)
+    # the first page reports the total, so no trailing empty page is requested
+    assert sorted(call["params"]["start"] for call in fake_env.get_calls) == [0, 1]
+    assert sorted(it["key"] for it in fake_env.written) == ["ABCD1", "WXYZ2"]
+
+
+def test_zot_import_searches_when_library_has_more_pages_than_titles(
+    big_library: _FakeSession, asr_csv_tmp: Path
+):
+    res = apply_asreview_decisions(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    # Only the first page is read, for Total-Results; then one search per title
+    listing = [call for call in big_library.get_calls if "q" not in call["params"]]
+    assert [call["params"]["start"] for call in listing] == [0]
+    searches = [
+        call["params"]["q"] for call in big_library.get_calls if call not in listing
+    ]
+    assert sorted(searches) == ["has doi", "no doi title"]
+    assert sorted(it["key"] for it in big_library.written) == ["ABCD1", "WXYZ2"]
+
+
+def test_zot_import_search_skips_attachments(
+    big_library: _FakeSession, asr_csv_tmp: Path
+):
+    # De zoekopdracht op titel vindt ook de PDF-bijlage van het artikel
+    attachment = {
+        "key": "PDF01",
+        "version": 5,
+        "data": {"title": "has doi", "itemType": "attachment", "tags": []},
+    }
+    big_library.items_index["has doi"].insert(0, attachment)
+
+    res = apply_asreview_decisions(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    assert sorted(it["key"] for it in big_library.written) == ["ABCD1", "WXYZ2"]
+    searches = [
+        call["params"] for call in big_library.get_calls if "q" in call["params"]
+    ]
+    assert {p["itemType"] for p in searches} == {"-attachment || note"}
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_zot_import_local_match_skips_attachments(
+    fake_env: _FakeSession,
+    asr_csv_tmp: Path,
+    tmp_path: Path,
+    use_cache: bool,
+):
+    # Een PDF-bijlage met dezelfde titel als het artikel, en vóór het artikel
+    attachment = {
+        "key": "PDF01",
+        "version": 5,
+        "data": {"title": "has doi", "itemType": "attachment", "tags": []},
+    }
+    fake_env.items_index = {"has doi.pdf": [attachment], **fake_env.items_index}
+
+    res = apply_asreview_decisions(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+        cache_dir=tmp_path / "cache" if use_cache else None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    assert sorted(it["key"] for it in fake_env.written) == ["ABCD1", "WXYZ2"]
+
+
+def test_zot_import_retries_stale_item_with_patch(
+    fake_env: _FakeSession, asr_csv_tmp: Path
+):
+    # The first item changed on the server after it was read: its batched write
+    # fails with 412 and is redone as a single PATCH on the current version
+    fake_env.stale_keys.add("ABCD1")
+
+    res = apply_asreview_decisions(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    assert [it["key"] for it in fake_env.written] == ["WXYZ2"]
+    assert len(fake_env.patch_calls) == 1
+    patch = fake_env.patch_calls[0]
+    assert patch["url"].endswith("/items/ABCD1")
+    assert patch["headers"] == {"If-Unmodified-Since-Version": "11"}
+    assert "review:Decision=included" in {t["tag"] for t in patch["payload"]["tags"]}
+
+
+def test_zot_import_rerun_writes_nothing(fake_env: _FakeSession, asr_csv_tmp: Path):
+    kwargs = dict(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+    assert apply_asreview_decisions(**kwargs)["updated"] == 2
+    assert len(fake_env.post_calls) == 1
+
+    # The items now carry every review tag: the second run skips the write
+    assert apply_asreview_decisions(**kwargs) == {
+        "updated": 2,
+        "not_found": 0,
+        "errors": 0,
+    }
+    assert len(fake_env.post_calls) == 1
+
+
+def test_zot_import_cache_dir_fetches_only_changes(
+    fake_env: _FakeSession, asr_csv_tmp: Path, tmp_path: Path
+):
+    kwargs = dict(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+        dry_run=True,
+        cache_dir=tmp_path / "cache",
+    )
+    # First run: the whole library is downloaded by key and cached, no searches
+    assert apply_asreview_decisions(**kwargs)["updated"] == 2
+    assert all("q" not in (call["params"] or {}) for call in fake_env.get_calls)
+    assert (tmp_path / "cache" / "groups-6143565.json").exists()
+
+    # Second run: nothing changed, so only the change and deletion lists are read
+    fake_env.get_calls.clear()
+    assert apply_asreview_decisions(**kwargs) == {
+        "updated": 2,
+        "not_found": 0,
+        "errors": 0,
+    }
+    assert [call["params"] for call in fake_env.get_calls] == [
+        {"format": "versions", "since": 10, "includeTrashed": 1},
+        {"since": 10},
+    ]
+
+
+def test_zot_import_cache_dir_drops_trashed_items(
+    fake_env: _FakeSession, asr_csv_tmp: Path, tmp_path: Path
+):
+    kwargs = dict(
+        asr_csv=asr_csv_tmp,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+        dry_run=True,
+        cache_dir=tmp_path / "cache",
+    )
+    assert apply_asreview_decisions(**kwargs)["updated"] == 2
+
+    # Naar de prullenbak: nieuwe versie, maar niet onder /deleted
+    item = fake_env.items_index["has doi"][0]
+    item["version"] = 11
+    item["data"]["deleted"] = 1
+
+    # Alleen het tweede item wordt nog gevonden
+    assert apply_asreview_decisions(**kwargs)["updated"] == 1
+    cached = json.loads((tmp_path / "cache" / "groups-6143565.json").read_text())
+    assert sorted(cached["items"]) == ["WXYZ2"]
+
+
+def test_cli_import_cache_dir_uses_api_cache(
+    fake_env: _FakeSession, asr_csv_tmp: Path, tmp_path: Path, monkeypatch
+):
+    from click.testing import CliRunner
+    from espace.zotsync.__main__ import app
+
+    # Geen .env of database uit de omgeving: alleen de standaardwaarde van --db-path
+    monkeypatch.setenv(const.ENV_SKIP_DOTENV, "1")
+    monkeypatch.delenv(const.ENV_DB_PATH, raising=False)
+    args = ["import", str(asr_csv_tmp), "--library-id", "6143565", "--dry-run"]
+    args += ["--cache-dir", str(tmp_path / "cache")]
+
+    runner = CliRunner()
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert "updated=2" in result.output
+    assert (tmp_path / "cache" / "groups-6143565.json").exists()
+
+    # Tweede run: alleen de wijzigingen worden opgehaald, uit de cache gematcht
+    fake_env.get_calls.clear()
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert [call["params"] for call in fake_env.get_calls] == [
+        {"format": "versions", "since": 10, "includeTrashed": 1},
+        {"since": 10},
+    ]
+
+
+def test_cli_import_cache_dir_rejects_db_path(
+    fake_env: _FakeSession, asr_csv_tmp: Path, tmp_path: Path, monkeypatch
+):
+    from click.testing import CliRunner
+    from espace.zotsync.__main__ import app
+
+    monkeypatch.setenv(const.ENV_SKIP_DOTENV, "1")
+    result = CliRunner().invoke(
+        app,
+        ["import", str(asr_csv_tmp), "--library-id", "6143565"]
+        + ["--cache-dir", str(tmp_path / "cache")]
+        + ["--db-path", str(tmp_path / "zotero.sqlite")],
+    )
+
+    assert result.exit_code == 2
+    assert "--cache-dir" in result.output
+    assert fake_env.get_calls == []
+
+
+def test_zot_import_does_not_search_rows_without_tags(
+    big_library: _FakeSession, tmp_path: Path
+):
+    df = pd.DataFrame(
+        [
+            {"title": "has doi", "year": "2020", const.ASR_LABEL_COL: 1},
+            # not yet screened: no decision, so no tags to set
+            {"title": "no doi title", "year": "2021", const.ASR_LABEL_COL: ""},
+        ]
+    )
+    p = tmp_path / "asr_unlabeled.csv"
+    df.to_csv(p, index=False)
+
+    res = apply_asreview_decisions(
+        asr_csv=p,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 1, "not_found": 0, "errors": 0}
+    searches = [call["params"].get("q") for call in big_library.get_calls]
+    assert [q for q in searches if q is not None] == ["has doi"]
+
+
+def test_zot_import_merges_tags_of_rows_matching_one_item(
+    big_library: _FakeSession, tmp_path: Path
+):
+    # Twee rijen, twee zoekopdrachten, hetzelfde Zotero-item: beide rijen tellen mee
+    df = pd.DataFrame(
+        [
+            {"title": "has doi", "year": "2020", const.ASR_LABEL_COL: 1},
+            {
+                "title": "has doi",
+                "year": "",
+                const.ASR_LABEL_COL: 1,
+                const.ASR_NOTE_COL: "second row reason",
+            },
+        ]
+    )
+    p = tmp_path / "asr_same_item.csv"
+    df.to_csv(p, index=False)
+
+    res = apply_asreview_decisions(
+        asr_csv=p,
+        api_key="dummy",
+        library_id="6143565",
+        library_type="groups",
+        db_path=None,
+    )
+
+    assert res == {"updated": 2, "not_found": 0, "errors": 0}
+    assert [it["key"] for it in big_library.written] == ["ABCD1"]
+    assert {t["tag"] for t in big_library.written[0]["tags"]} == {
+        "review:Decision=included",
+        "review:Reason=second row reason",
+    }
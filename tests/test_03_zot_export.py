@@ -135,3 +135,76 @@ def test_make_asreview_csv_from_db_via_main_using_dotenv(tmp_path: Path):
     for col in ["title", "abstract", "authors", "doi", "url", "year"]:
         assert col in df.columns
     assert not df.empty
+
+
+def test_make_asreview_csv_deduplicates_across_chunks(tmp_path: Path, monkeypatch):
+    import espace.zotsync.zot_export as m
+
+    # Elke rij is een eigen chunk: dubbele DOI's moeten ook over chunks heen wegvallen
+    monkeypatch.setattr(m, "_CSV_CHUNK_ROWS", 1)
+    input_file = tmp_path / "zotero.csv"
+    pd.DataFrame(
+        [
+            {"Title": "A", "Publication Year": "2020", "DOI": "10.1/a"},
+            {"Title": "A (copy)", "Publication Year": "2020", "DOI": "10.1/A"},
+            {"Title": "B", "Publication Year": "2021", "DOI": ""},
+            {"Title": "C", "Publication Year": "", "DOI": ""},
+        ]
+    ).to_csv(input_file, index=False)
+    output_file = tmp_path / "out.csv"
+
+    make_asreview_csv(zotero_csv=input_file, out_csv=output_file)
+
+    df = pd.read_csv(output_file, dtype=str, keep_default_na=False)
+    assert df["title"].tolist() == ["A", "B", "C"]
+    assert df["year"].tolist() == ["2020", "2021", ""]
+
+
+def test_make_asreview_csv_pdf_links_looked_up_once_per_doi(
+    tmp_path: Path, monkeypatch
+):
+    import espace.zotsync.zot_export as m
+
+    calls = []
+
+    def fake_link(session, base, doi):
+        calls.append(doi)
+        return f"zotero://open-pdf/library/items/{doi.upper()}" if doi else ""
+
+    monkeypatch.setattr(m, "_pdf_link_for_doi", fake_link)
+    input_file = tmp_path / "zotero.csv"
+    pd.DataFrame(
+        [
+            {"Title": "A", "DOI": "a"},
+            {"Title": "A again", "DOI": "a"},
+            {"Title": "B", "DOI": ""},
+        ]
+    ).to_csv(input_file, index=False)
+    output_file = tmp_path / "out.csv"
+
+    make_asreview_csv(
+        zotero_csv=input_file,
+        out_csv=output_file,
+        api_key="dummy",
+        library_id="123",
+        add_pdf_links=True,
+        deduplicate=False,
+    )
+
+    df = pd.read_csv(output_file, dtype=str, keep_default_na=False)
+    assert sorted(calls) == ["", "a"]
+    assert df["zotero_pdf"].tolist() == [
+        "zotero://open-pdf/library/items/A",
+        "zotero://open-pdf/library/items/A",
+        "",
+    ]
+
+
+@pytest.mark.parametrize(
+    "date,year",
+    [("2020-05-01", "2020"), ("May 2019", "2019"), ("1²34 x", ""), ("", "")],
+)
+def test_guess_year(date, year):
+    from espace.zotsync.zot_export import _guess_year
+
+    assert _guess_year(date) == year
@@ -4,6 +4,9 @@ import os
 import pandas as pd
 import pytest
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from espace.zotsync import const
 from espace.zotsync.zot_import import apply_asreview_decisions
 
@@ -20,6 +23,7 @@ Credentials should be provided via env vars:
 """
 
 ZOTERO_HOST = "https://api.zotero.org"
+_REVIEW = const.TAG_PREFIX_REVIEW
 
 
 def _base_url(library_type: str, library_id: str) -> str:
@@ -46,12 +50,27 @@ def _remove_all_review_tags(base: str, headers: dict, *, limit: int = 100) -> in
 
     Returns the number of items that were updated.
     """
-    updated = 0
+    # One pooled session for paging and the PUTs, which run concurrently
+    sess = requests.Session()
+    sess.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,
+        ),
+    )
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+
+    to_update = []
     start = 0
     while True:
-        r = requests.get(
+        r = sess.get(
             f"{base}/items",
-            headers=headers,
             params={"format": "json", "limit": limit, "start": start},
         )
         r.raise_for_status()
@@ -61,24 +80,27 @@ def _remove_all_review_tags(base: str, headers: dict, *, limit: int = 100) -> in
         for it in items:
             data = it.get("data", {})
             tags = data.get("tags", []) or []
-            new_tags = [
-                tg for tg in tags if not str(tg.get("tag", "")).startswith("review:")
+            # Most items carry no review tags: skip them before copying the list
+            if not any(tg.get("tag", "").startswith(_REVIEW) for tg in tags):
+                continue
+            data["tags"] = [
+                tg for tg in tags if not tg.get("tag", "").startswith(_REVIEW)
             ]
-            if len(new_tags) != len(tags):
-                data["tags"] = new_tags
-                key = it.get("key")
-                ver = it.get("version")
-                resp = requests.put(
-                    f"{base}/items/{key}",
-                    headers=headers,
-                    json={"key": key, "version": ver, "data": data},
-                )
-                # Accept both 200 and 204 as success
-                if resp.status_code in (200, 204):
-                    updated += 1
+            to_update.append((it.get("key"), it.get("version"), data))
         # paginate
         start += limit
-    return updated
+
+    def put(update) -> bool:
+        key, ver, data = update
+        resp = sess.put(
+            f"{base}/items/{key}",
+            json={"key": key, "version": ver, "data": data},
+        )
+        # Accept both 200 and 204 as success
+        return resp.status_code in (200, 204)
+
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return sum(ex.map(put, to_update))
 
 
 @pytest.mark.integration
@@ -200,17 +222,10 @@ def test_zot_import_csv_counts():
     assert len(df) == 41, f"Expected 41 rows, found {len(df)}"
     assert "asreview_label" in df.columns, "CSV must contain 'asreview_label' column"
 
-    def to_label(v) -> str:
-        s = ("" if pd.isna(v) else str(v)).strip().lower()
-        if s in {"1", "included", "relevant", "yes", "true", "y"}:
-            return "included"
-        if s in {"0", "-1", "excluded", "irrelevant", "no", "false", "n"}:
-            return "excluded"
-        # default to excluded if unspecified
-        return "excluded"
-
-    mapped = df["asreview_label"].map(to_label)
-    included = int((mapped == "included").sum())
+    labels = df["asreview_label"].astype("string").str.strip().str.lower().fillna("")
+    # anything not explicitly included counts as excluded
+    included_mask = labels.isin({"1", "included", "relevant", "yes", "true", "y"})
+    included = int(included_mask.sum())
     excluded = len(df) - included
 
     assert included == 9, f"Expected 9 included, found {included}"
@@ -344,16 +359,10 @@ def test_zot_import_csv_counts_sqlite():
     assert len(df) == 41, f"Expected 41 rows, found {len(df)}"
     assert "asreview_label" in df.columns, "CSV must contain 'asreview_label' column"
 
-    def to_label(v) -> str:
-        s = ("" if pd.isna(v) else str(v)).strip().lower()
-        if s in {"1", "included", "relevant", "yes", "true", "y"}:
-            return "included"
-        if s in {"0", "-1", "excluded", "irrelevant", "no", "false", "n"}:
-            return "excluded"
-        return "excluded"
-
-    mapped = df["asreview_label"].map(to_label)
-    included = int((mapped == "included").sum())
+    labels = df["asreview_label"].astype("string").str.strip().str.lower().fillna("")
+    # anything not explicitly included counts as excluded
+    included_mask = labels.isin({"1", "included", "relevant", "yes", "true", "y"})
+    included = int(included_mask.sum())
     excluded = len(df) - included
 
     assert included == 9, f"Expected 9 included, found {included}"
@@ -8,17 +8,20 @@ from dotenv import load_dotenv
 from espace.zotsync import zot_import
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(scope="module", autouse=True)
 def load_env():
     load_dotenv()
 
 
-def _make_sqlite_db(tmp_path: Path) -> Path:
-    """Maak een minimale SQLite-db met 1 item en 1 review-tag."""
-    db_path = tmp_path / "zotero.sqlite"
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.executescript(
+@pytest.fixture(scope="module")
+def sqlite_template():
+    """Maak een minimale SQLite-db met 1 item en 1 review-tag.
+
+    Eén keer per module in het geheugen opgebouwd; tests krijgen een kopie
+    via de fixture `sqlite_db` (conftest.py).
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(
         """
         CREATE TABLE libraries (libraryID INTEGER);
         INSERT INTO libraries (libraryID) VALUES (1);
@@ -26,7 +29,10 @@ def _make_sqlite_db(tmp_path: Path) -> Path:
         CREATE TABLE groups (groupID INTEGER, libraryID INTEGER, name TEXT);
         INSERT INTO groups (groupID, libraryID, name) VALUES (123, 1, 'Group 1');
 
-        CREATE TABLE items (itemID INTEGER PRIMARY KEY, libraryID INTEGER, key TEXT);
+        CREATE TABLE items (
+            itemID INTEGER PRIMARY KEY, libraryID INTEGER, key TEXT,
+            UNIQUE (libraryID, key)
+        );
         INSERT INTO items (itemID, libraryID, key)
             VALUES (100, 1, 'ABCD1'),
                    (101, 1, 'WXYZ2');
@@ -39,57 +45,66 @@ def _make_sqlite_db(tmp_path: Path) -> Path:
             VALUES (1, 'has doi'),
                    (2, 'no doi title');
 
-        CREATE TABLE itemData (itemID INTEGER, fieldID INTEGER, valueID INTEGER);
+        CREATE TABLE itemData (
+            itemID INTEGER, fieldID INTEGER, valueID INTEGER,
+            PRIMARY KEY (itemID, fieldID)
+        );
         INSERT INTO itemData (itemID, fieldID, valueID)
             VALUES (100, 1, 1),
                    (101, 1, 2);
 
         -- Review-tags tabellen
-        CREATE TABLE tags (tagID INTEGER PRIMARY KEY, name TEXT);
-        CREATE TABLE itemTags (itemID INTEGER, tagID INTEGER, type INTEGER);
+        CREATE TABLE tags (tagID INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+        CREATE TABLE itemTags (
+            itemID INTEGER, tagID INTEGER, type INTEGER,
+            PRIMARY KEY (itemID, tagID)
+        );
+        CREATE INDEX itemTags_tagID ON itemTags(tagID);
 
         -- Koppel één review-tag aan item 100
         INSERT INTO tags (tagID, name) VALUES (1, 'review:Decision=included');
         INSERT INTO itemTags (itemID, tagID, type) VALUES (100, 1, 0);
         """
     )
-    conn.commit()
+    yield conn
     conn.close()
-    return db_path
 
 
 def count_review_tags(db_path: Path, group_id: int, tag_prefix: str) -> int:
     """Tel het aantal review-tags in de database met de gegeven prefix."""
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute("SELECT libraryID FROM groups WHERE groupID = ?", (group_id,))
-    group = cur.fetchone()
-    if not group:
-        return 0
-    group = group[0]
-
-    cur.execute(
-        """
-        SELECT COUNT(*)
-        FROM itemTags it
-        JOIN tags t ON it.tagID = t.tagID
-        JOIN items i ON it.itemID = i.itemID
-        WHERE t.name LIKE ? AND i.libraryID = ?
-        """,
-        (f"{tag_prefix}:%", group),
-    )
-    count = cur.fetchone()[0]
-    conn.close()
-    return count
+    # Alleen-lezen: geen journal of schrijflock nodig (immutable niet, de tests
+    # tellen ook na wijzigingen en Zotero kan de echte database openhebben)
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        # groupID → libraryID in dezelfde query; geen groep betekent 0
+        return conn.execute(
+            """
+            SELECT COUNT(*)
+            FROM itemTags it
+            JOIN tags t ON it.tagID = t.tagID
+            JOIN items i ON it.itemID = i.itemID
+            JOIN groups g ON g.libraryID = i.libraryID
+            WHERE t.name >= ? AND t.name < ? AND g.groupID = ?
+            """,
+            # 'prefix:' t/m 'prefix;' (';' volgt direct op ':'): bereik op de index van tags.name
+            (f"{tag_prefix}:", f"{tag_prefix};", group_id),
+        ).fetchone()[0]
+    finally:
+        conn.close()
 
 
 def test_remove_review_tags_sqlite(tmp_path):
 
     group_id = os.getenv("ZOTERO_LIBRARY_ID")
-    # db_path = _make_sqlite_db(tmp_path)
+    if not group_id:
+        pytest.skip("ZOTERO_LIBRARY_ID niet gezet")
     db_path = const.DEFAULT_SQLITE_PATH
+    if not db_path.exists():
+        pytest.skip(f"Geen Zotero database gevonden op {db_path}")
     # Tel het aantal review-tags gekoppeld aan items vóór verwijdering
     initial_count = count_review_tags(db_path, group_id, const.REVIEW_PREFIX)
+    if initial_count == 0:
+        pytest.skip("Geen review-tags aanwezig om te verwijderen")
 
     result = zot_import.remove_review_tags(
         api_key="unused",
@@ -105,22 +120,48 @@ def test_remove_review_tags_sqlite(tmp_path):
     assert count == 0
 
 
-def test_remove_review_tags_dry_run(tmp_path):
-    db_path = _make_sqlite_db(tmp_path)
+@pytest.mark.parametrize("dry_run,remaining", [(True, 1), (False, 0)])
+def test_remove_review_tags_fixture(sqlite_db, dry_run, remaining):
+    db_path = sqlite_db
     result = zot_import.remove_review_tags(
         api_key="unused",
         library_id=123,
         library_type="groups",
         db_path=db_path,
-        dry_run=True,
+        dry_run=dry_run,
     )
     assert result["removed"] == 1
     assert result["errors"] == 0
 
-    # Controleer dat de tag nog steeds aanwezig is
+    # Dry-run laat de tag staan, anders is hij verwijderd
+    assert count_review_tags(db_path, 123, const.REVIEW_PREFIX) == remaining
+
+
+def test_remove_review_tags_many_tags_keeps_other_library(sqlite_db):
+    db_path = sqlite_db
+    conn = sqlite3.connect(db_path)
+    # Meer review-tags dan er parameters in één statement passen, plus een item in
+    # een andere library dat een van die tags deelt
+    conn.executemany(
+        "INSERT INTO tags (tagID, name) VALUES (?, ?)",
+        [(i, f"review:Reason=r{i}") for i in range(2, 1502)],
+    )
+    conn.executemany(
+        "INSERT INTO itemTags (itemID, tagID, type) VALUES (?, ?, 0)",
+        [(101, i) for i in range(2, 1502)],
+    )
+    conn.execute("INSERT INTO items (itemID, libraryID, key) VALUES (200, 2, 'OTHER')")
+    conn.execute("INSERT INTO itemTags (itemID, tagID, type) VALUES (200, 2, 0)")
+    conn.commit()
+    conn.close()
+
+    result = zot_import.remove_review_tags(
+        api_key="unused", library_id=123, library_type="groups", db_path=db_path
+    )
+    assert result == {"removed": 1501, "errors": 0}
+
     conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM itemTags")
-    rows = cur.fetchall()
+    assert conn.execute("SELECT itemID, tagID FROM itemTags").fetchall() == [(200, 2)]
+    # alleen de tag die nog in gebruik is blijft over
+    assert conn.execute("SELECT tagID FROM tags").fetchall() == [(2,)]
     conn.close()
-    assert len(rows) == 1